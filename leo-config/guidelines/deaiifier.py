@@ -6,10 +6,313 @@
 """
 
 import yaml
+import os
 import re
 import random
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Literal
+from typing import Callable, Dict, List, Optional, Literal, Tuple
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML 未编译 libyaml 时退化为纯 Python 解析器
+    from yaml import SafeLoader
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick 未安装时退化为正则交替匹配
+    ahocorasick = None
+
+# 创意模式：时间表达口语化
+DURATION_REPLACEMENTS = {
+    '6个月': '差不多半年',
+    '12个月': '差不多一年',
+}
+
+# 严谨模式：配置之外固定的严谨化替换
+RIGOR_REPLACEMENTS = {
+    '高达': '约',
+    '轻松': '',
+    '！': '。',
+}
+
+# 句式调整：数字百分比与时间表达合成一个正则，一次扫描按命中的分组分派替换
+SENTENCE_PATTERN = re.compile(
+    r'(?P<percent>\d+%)|(?P<duration>'
+    + '|'.join(map(re.escape, sorted(DURATION_REPLACEMENTS, key=len, reverse=True)))
+    + ')'
+)
+
+DIGIT_OR_PERCENT = re.compile(r'[\d%]')
+
+# 数据标注：百分比或"万"为单位的数字
+DATA_PATTERN = re.compile(r'\d+[％%万]')
+DATA_UNLABELED_PATTERN = re.compile(r'\d+[％%万](?![左右约])')
+
+# 风险提示：含收益类数据时添加风险提示，质量检查时提到收益、回报则要求有风险提示
+RISK_TRIGGER_PATTERN = re.compile('收益|回报|赚|[%％]')
+RISK_KEYWORD_PATTERN = re.compile('收益|回报')
+# 检查文档末尾是否已有风险提示时，在提示语长度之外多查的字符数（容纳标题和末尾空白）
+DISCLAIMER_TAIL_SLACK = 80
+
+# 质量问题类型对应的改进建议
+ISSUE_SUGGESTIONS = {
+    'jargon': "替换为更自然的口语化表达",
+    'absolute': "替换为更自然的口语化表达",
+    'no_colloquial': "加入个人感受表达，如'我觉得''说实话'",
+    'exaggeration': "使用更准确客观的表述，避免夸大",
+    'no_uncertainty': "为数据添加'约''左右'等不确定性标注",
+    'no_risk': "添加风险提示说明",
+}
+
+
+@lru_cache(maxsize=8)
+def _load_config(config_path: str, mtime_ns: int) -> Dict:
+    """
+    加载配置文件，按 (路径, 修改时间) 缓存，同一份配置的处理器共享解析结果（只读）
+
+    Args:
+        config_path: 配置文件路径
+        mtime_ns: 配置文件修改时间，仅作缓存键，文件修改后自动重新加载
+    """
+    return _read_config(config_path)
+
+
+@lru_cache(maxsize=8)
+def _load_replacers(config_path: str, mtime_ns: int) -> Tuple[Optional[Callable[[str], str]], ...]:
+    """
+    按 (路径, 修改时间) 缓存配置对应的替换函数
+
+    返回营销黑话、绝对化表达、夸大表达的替换函数，以及创意模式、严谨模式的
+    合并替换函数（不能安全合并时为 None）。
+    """
+    config = _load_config(config_path, mtime_ns)
+    creative_config = config.get('creative_mode', {})
+    formal_config = config.get('formal_mode', {})
+    jargon = creative_config.get('marketing_jargon_replacements', {})
+    absolutes = creative_config.get('avoid_absolutes', {})
+    exaggeration = formal_config.get('avoid_exaggeration', {})
+    return (
+        _build_replacer(jargon),
+        _build_replacer(absolutes),
+        _build_replacer(exaggeration),
+        _build_creative_replacer(jargon, absolutes, _colloquial_phrases(creative_config)),
+        _build_merged_replacer(exaggeration, RIGOR_REPLACEMENTS),
+    )
+
+
+def _colloquial_phrases(creative_config: Dict) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """返回 (段落开头用的开场白和个人感受, 句中用的不确定性表达)"""
+    colloquial = creative_config.get('colloquial_style', {})
+    return (
+        tuple(colloquial.get('opening', ['我跟你说']) + colloquial.get('personal_touch', ['我觉得'])),
+        tuple(colloquial.get('uncertainty', ['差不多'])),
+    )
+
+
+@lru_cache(maxsize=8)
+def _load_finders(config_path: str, mtime_ns: int) -> Tuple[Callable[[str], set], ...]:
+    """按 (路径, 修改时间) 缓存质量检查用的营销黑话、绝对化表达、口语化短语、夸大表达查找函数"""
+    config = _load_config(config_path, mtime_ns)
+    creative_config = config.get('creative_mode', {})
+    formal_config = config.get('formal_mode', {})
+    colloquial = creative_config.get('colloquial_style', {})
+    return (
+        _build_finder(creative_config.get('marketing_jargon_replacements', {})),
+        _build_finder(creative_config.get('avoid_absolutes', {})),
+        _build_finder(
+            colloquial.get('opening', []) +
+            colloquial.get('personal_touch', []) +
+            colloquial.get('uncertainty', [])
+        ),
+        _build_finder(formal_config.get('avoid_exaggeration', {})),
+    )
+
+
+def _read_config(config_path) -> Dict:
+    """读取配置文件"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def _build_replacer(mapping: Dict[str, str]) -> Callable[[str], str]:
+    """
+    把替换表编译为替换函数，一次扫描完成整张表的替换（最左最长、互不重叠）
+
+    与其他键互不相关的单字键放进 str.translate 的转换表；其余的键在安装了
+    pyahocorasick 时构建 Aho-Corasick 自动机，否则编译为交替正则（较长的键优先匹配）。
+    """
+    keys = sorted((k for k in mapping if k), key=len, reverse=True)
+
+    # 单字键不出现在其余键中、替换结果非空且不含其余键的字时，先逐字转换
+    # 不会拆开或拼出其余的键，结果与整表一次替换相同
+    rest = {k for k in keys if len(k) > 1 or not mapping[k]}
+    while True:
+        rest_chars = set(''.join(rest))
+        moved = {
+            k for k in keys
+            if k not in rest and (k in rest_chars or not rest_chars.isdisjoint(mapping[k]))
+        }
+        if not moved:
+            break
+        rest |= moved
+
+    chars = {k: mapping[k] for k in keys if k not in rest}
+    char_table = str.maketrans(chars) if chars else None
+    keys = [k for k in keys if k in rest]
+
+    if not keys:
+        if char_table is None:
+            return lambda text: text
+        return lambda text: text.translate(char_table)
+
+    first_chars = frozenset(k[0] for k in keys)
+
+    if ahocorasick is None:
+        pattern = re.compile('|'.join(map(re.escape, keys)))
+
+        def substitute(text: str) -> str:
+            return pattern.sub(lambda m: mapping[m.group(0)], text)
+    else:
+        automaton = ahocorasick.Automaton()
+        for key in keys:
+            automaton.add_word(key, (key, mapping[key]))
+        automaton.make_automaton()
+
+        def substitute(text: str) -> str:
+            # 自动机按结束位置报告全部命中，按 (起点, 长度降序) 排序后贪心取不重叠的命中
+            matches = sorted(
+                (end - len(key) + 1, -len(key), key, replacement)
+                for end, (key, replacement) in automaton.iter(text)
+            )
+            if not matches:
+                return text
+
+            parts = []
+            pos = 0
+            for start, _, key, replacement in matches:
+                if start < pos:
+                    continue
+                parts.append(text[pos:start])
+                parts.append(replacement)
+                pos = start + len(key)
+            parts.append(text[pos:])
+            return ''.join(parts)
+
+    def replace(text: str) -> str:
+        if char_table is not None:
+            text = text.translate(char_table)
+
+        # 预筛：文本中没有任何键的首字时不可能命中，跳过整张表的扫描
+        if not any(c in text for c in first_chars):
+            return text
+        return substitute(text)
+
+    return replace
+
+
+def _build_finder(keys) -> Callable[[str], set]:
+    """
+    把关键词编译为查找函数，返回文本中出现过的关键词集合
+
+    安装了 pyahocorasick 时一次扫描找出全部关键词（包括相互重叠的），否则逐个判断。
+    """
+    keys = [k for k in dict.fromkeys(keys) if k]
+    if ahocorasick is None or not keys:
+        return lambda text: {k for k in keys if k in text}
+
+    automaton = ahocorasick.Automaton()
+    for key in keys:
+        automaton.add_word(key, key)
+    automaton.make_automaton()
+    return lambda text: {key for _, key in automaton.iter(text)}
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """两个字符串在文本中能否部分或完全重叠（一个包含另一个，或首尾相接处重合）"""
+    if a in b or b in a:
+        return True
+    return any(a.endswith(b[:i]) or b.endswith(a[:i]) for i in range(1, min(len(a), len(b))))
+
+
+def _build_merged_replacer(
+    first: Dict[str, str],
+    second: Dict[str, str]
+) -> Optional[Callable[[str], str]]:
+    """
+    把先后执行的两张替换表合成一张，一次扫描完成
+
+    两张表的键互不重叠、第一张表的替换结果非空且不会被第二张表命中时，合并后与先后
+    替换结果相同；否则返回 None。
+    """
+    if not all(first.values()):
+        return None
+    if any(_overlaps(a, b) for a in list(first) + list(first.values()) for b in second):
+        return None
+    return _build_replacer({**first, **second})
+
+
+def _build_creative_replacer(
+    jargon: Dict[str, str],
+    absolutes: Dict[str, str],
+    phrases: Tuple[Tuple[str, ...], Tuple[str, ...]]
+) -> Optional[Callable[[str], str]]:
+    """
+    把创意模式的营销黑话、绝对化表达、句式调整合成一个正则，一次扫描完成三步替换
+
+    只有各步的键互不重叠、前一步的替换结果（以及之后插入的口语化短语）不会被后一步
+    再次命中、且没有删除式替换时，一次扫描才与逐步替换结果相同；否则返回 None，
+    由调用方按原顺序逐步处理。
+    """
+    jargon_keys, absolute_keys = list(jargon), list(absolutes)
+    duration_keys = list(DURATION_REPLACEMENTS)
+    jargon_outputs, absolute_outputs = list(jargon.values()), list(absolutes.values())
+    # 口语化短语连同其后的逗号一起插入
+    phrase_outputs = list(phrases[0] + phrases[1]) + ['，']
+
+    if not all(jargon_outputs + absolute_outputs):
+        return None
+    # 数字百分比规则：键、替换结果或口语化短语含数字或 % 时可能互相影响
+    if any(DIGIT_OR_PERCENT.search(x) for x in
+           jargon_keys + absolute_keys + jargon_outputs + absolute_outputs + phrase_outputs):
+        return None
+
+    # (前一步的键或替换结果, 之后步骤的键)
+    pairs = [
+        (jargon_keys, absolute_keys + duration_keys),
+        (absolute_keys, duration_keys),
+        (jargon_outputs, absolute_keys + duration_keys),
+        (absolute_outputs, duration_keys),
+        (phrase_outputs, duration_keys),
+    ]
+    if any(_overlaps(a, b) for earlier, later in pairs for a in earlier for b in later):
+        return None
+
+    groups = []
+    for name, keys in (('jargon', jargon_keys), ('absolute', absolute_keys)):
+        keys = sorted((k for k in keys if k), key=len, reverse=True)
+        if keys:
+            groups.append(f"(?P<{name}>{'|'.join(map(re.escape, keys))})")
+    pattern = re.compile('|'.join(groups + [SENTENCE_PATTERN.pattern]))
+
+    tables = {'jargon': jargon, 'absolute': absolutes, 'duration': DURATION_REPLACEMENTS}
+
+    def dispatch(match: "re.Match") -> str:
+        if match.lastgroup == 'percent':
+            return match.group(0) + '左右'
+        return tables[match.lastgroup][match.group(0)]
+
+    return lambda text: pattern.sub(dispatch, text)
+
+
+# 严谨模式固定替换与配置无关，导入时编译一次
+_rigor_sub = _build_replacer(RIGOR_REPLACEMENTS)
+
+
+def _sample_indices(indices: List[int], rate: float, rng: random.Random) -> List[int]:
+    """按比例无放回抽取下标，抽取个数随机取整，期望与逐个按概率抽取相同"""
+    k = int(len(indices) * rate + rng.random())
+    return rng.sample(indices, k)
 
 
 class DeAIifier:
@@ -41,14 +344,45 @@ class DeAIifier:
             current_file = Path(__file__)
             config_path = current_file.parent / "deaiification_guide.yaml"
 
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+        config_path = str(config_path)
+        mtime_ns = os.stat(config_path).st_mtime_ns
+        self.config = _load_config(config_path, mtime_ns)
 
         self.mode = mode
         self.creative_config = self.config.get('creative_mode', {})
         self.formal_config = self.config.get('formal_mode', {})
         self.skill_modes = self.config.get('skill_default_modes', {})
 
+        # 每个处理器独立的随机数生成器，不与其他线程争用模块级 random 的共享状态
+        self._rng = random.Random()
+
+        # 口语化短语（段落开头用开场白和个人感受，句中用不确定性表达）
+        self._openings_personal, self._uncertainty = _colloquial_phrases(self.creative_config)
+
+        # 风险提示语，未配置时严谨模式跳过风险提示这一步
+        self._disclaimers = tuple(self.formal_config.get('risk_disclaimers', []))
+
+        # 各替换表编译为替换函数，一次扫描完成整张表的替换
+        (self._jargon_sub, self._absolutes_sub, self._exaggeration_sub,
+         self._creative_sub, self._formal_sub) = _load_replacers(config_path, mtime_ns)
+
+        # 质量检查按配置顺序报告命中的关键词
+        self._jargon_keys = tuple(self.creative_config.get('marketing_jargon_replacements', {}))
+        self._absolutes_keys = tuple(self.creative_config.get('avoid_absolutes', {}))
+        self._exaggeration_keys = tuple(self.formal_config.get('avoid_exaggeration', {}))
+
+        # 质量检查用的查找函数，一次扫描找出文本中出现的全部关键词
+        (self._find_jargon, self._find_absolutes,
+         self._find_colloquial, self._find_exaggeration) = _load_finders(config_path, mtime_ns)
+
+    @classmethod
+    def reload(cls):
+        """清空缓存的配置与便捷函数的处理器，强制重新加载配置文件"""
+        _load_config.cache_clear()
+        _load_replacers.cache_clear()
+        _load_finders.cache_clear()
+        _get_processor.cache_clear()
+
     def process(
         self,
         text: str,
@@ -84,6 +418,10 @@ class DeAIifier:
         创意模式处理
         让内容更像真人说话，口语化、接地气
         """
+        if self._creative_sub is not None:
+            # 营销黑话、绝对化表达、句式调整一次扫描完成，再添加口语化元素
+            return self._add_colloquial_elements(self._creative_sub(text))
+
         # 1. 替换营销黑话
         text = self._replace_marketing_jargon(text)
 
@@ -118,104 +456,91 @@ class DeAIifier:
 
     def _replace_marketing_jargon(self, text: str) -> str:
         """替换营销黑话为更自然的表达"""
-        jargon_replacements = self.creative_config.get(
-            'marketing_jargon_replacements', {}
-        )
-
-        for jargon, natural in jargon_replacements.items():
-            text = text.replace(jargon, natural)
-
-        return text
+        return self._jargon_sub(text)
 
     def _replace_absolutes(self, text: str) -> str:
         """替换绝对化表达为相对化表达"""
-        avoid_absolutes = self.creative_config.get('avoid_absolutes', {})
-
-        for absolute, relative in avoid_absolutes.items():
-            text = text.replace(absolute, relative)
-
-        return text
+        return self._absolutes_sub(text)
 
     def _add_colloquial_elements(self, text: str) -> str:
         """添加口语化元素"""
-        colloquial = self.creative_config.get('colloquial_style', {})
-
-        # 获取口语化短语
-        openings = colloquial.get('opening', ['我跟你说'])
-        personal = colloquial.get('personal_touch', ['我觉得'])
-        uncertainty = colloquial.get('uncertainty', ['差不多'])
+        # 不足 6 行且没有逗号时既没有候选段落也无处插入，不必拆分文本
+        if '，' not in text and text.count('\n') < 5:
+            return text
 
         lines = text.split('\n')
-        result = []
-
-        for i, line in enumerate(lines):
-            # 跳过标题和空行
-            if not line.strip() or line.startswith('#') or line.startswith('|'):
-                result.append(line)
-                continue
-
-            # 在某些段落开头添加口语化表达（约15%的段落）
-            if i > 0 and i % 5 == 0 and random.random() < 0.15:
-                phrase = random.choice(openings + personal)
-                result.append(f"{phrase}，{line}")
-            else:
-                # 偶尔在句中添加不确定性表达
-                if random.random() < 0.1:
-                    phrase = random.choice(uncertainty)
-                    # 在句中适当位置插入
-                    if '，' in line:
-                        parts = line.split('，', 1)
-                        line = f"{parts[0]}，{phrase}，{parts[1]}"
-                result.append(line)
-
-        return '\n'.join(result)
+        skip_prefixes = ('#', '|')
+
+        # 只检查每隔 5 行的候选段落（跳过标题、表格和空行），
+        # 先抽定要改写的段落再统一写入：约15%的候选段落开头添加口语化表达
+        candidates = [
+            i for i in range(5, len(lines), 5)
+            if lines[i].strip() and not lines[i].startswith(skip_prefixes)
+        ]
+        opened = _sample_indices(candidates, 0.15, self._rng)
+        for i, phrase in zip(opened, self._rng.choices(self._openings_personal, k=len(opened))):
+            lines[i] = f"{phrase}，{lines[i]}"
+
+        # 其余段落约10%在第一个逗号后插入不确定性表达
+        skipped = set(opened)
+        rest = [
+            i for i, line in enumerate(lines)
+            if '，' in line and i not in skipped and not line.startswith(skip_prefixes)
+        ]
+        inserted = _sample_indices(rest, 0.1, self._rng)
+        for i, phrase in zip(inserted, self._rng.choices(self._uncertainty, k=len(inserted))):
+            head, tail = lines[i].split('，', 1)
+            lines[i] = f"{head}，{phrase}，{tail}"
+
+        # 没有改写任何段落时直接返回原文，省去重新拼接
+        if not opened and not inserted:
+            return text
+        return '\n'.join(lines)
 
     def _adjust_sentence_patterns(self, text: str) -> str:
         """调整句式，让表达更自然"""
-        # 调整数字表达
-        text = re.sub(r'(\d+)%', r'\1%左右', text)
+        # 数字表达加"左右"，时间表达改为口语
+        return SENTENCE_PATTERN.sub(self._adjust_sentence_match, text)
 
-        # 调整时间表达
-        text = text.replace('6个月', '差不多半年')
-        text = text.replace('12个月', '差不多一年')
-
-        return text
+    @staticmethod
+    def _adjust_sentence_match(match: "re.Match") -> str:
+        """按命中的分组返回句式调整后的文本"""
+        if match.lastgroup == 'percent':
+            return match.group(0) + '左右'
+        return DURATION_REPLACEMENTS[match.group(0)]
 
     # ==================== 严谨模式方法 ====================
 
     def _replace_exaggeration(self, text: str) -> str:
         """替换夸大表达"""
-        avoid = self.formal_config.get('avoid_exaggeration', {})
+        if self._formal_sub is not None:
+            # 夸大表达与固定的严谨化替换合成一张表，一次扫描完成（单字替换走 str.translate）
+            return self._formal_sub(text)
 
-        for exaggerated, accurate in avoid.items():
-            text = text.replace(exaggerated, accurate)
+        text = self._exaggeration_sub(text)
 
         # 额外的严谨化处理
-        text = text.replace('高达', '约')
-        text = text.replace('轻松', '')
-        text = text.replace('！', '。')
-
-        return text
+        return _rigor_sub(text)
 
     def _add_data_sources(self, text: str) -> str:
         """为数据添加来源标注"""
-        # 检测数字和百分比，添加"约"或"左右"
-        text = re.sub(r'(\d+)([％%])(?![左右约约])', r'\1\2左右', text)
-        text = re.sub(r'(\d+)万(?![左右约约])', r'\1万左右', text)
-
-        return text
+        # 检测数字、百分比和"万"，添加"左右"
+        return DATA_UNLABELED_PATTERN.sub(r'\g<0>左右', text)
 
     def _add_risk_disclaimers(self, text: str) -> str:
         """添加风险提示"""
-        disclaimers = self.formal_config.get('risk_disclaimers', [])
+        disclaimers = self._disclaimers
+        if not disclaimers:
+            return text
 
         # 如果文本中包含收益数据，添加风险提示
-        if any(keyword in text for keyword in ['收益', '回报', '赚', '%', '％']):
+        if RISK_TRIGGER_PATTERN.search(text):
             # 选择合适的风险提示
-            disclaimer = random.choice(disclaimers) if disclaimers else ""
+            disclaimer = self._rng.choice(disclaimers)
 
-            # 在文档末尾添加（如果还没有）
-            if disclaimer and disclaimer not in text:
+            # 在文档末尾添加（如果还没有）；已添加过的提示位于末尾，先只查末尾一段，未命中再查全文
+            tail = text[-(len(disclaimer) + DISCLAIMER_TAIL_SLACK):]
+            if disclaimer and disclaimer not in tail and disclaimer not in text:
                 text = text.rstrip() + f"\n\n**风险提示**: {disclaimer}"
 
         return text
@@ -235,64 +560,64 @@ class DeAIifier:
             mode: 检查模式
 
         Returns:
-            检查结果字典
+            检查结果字典，issue_types 与 issues 一一对应，为问题类型（见 ISSUE_SUGGESTIONS）
         """
         effective_mode = mode or self._determine_mode()
         issues = []
+        issue_types = []
         score = 100
 
         if effective_mode == "creative":
             # 创意模式质量检查
             # 检查营销黑话
-            jargon = self.creative_config.get('marketing_jargon_replacements', {})
-            found_jargon = [k for k in jargon if k in text]
+            found = self._find_jargon(text)
+            found_jargon = [k for k in self._jargon_keys if k in found]
             if found_jargon:
                 issues.append(f"发现营销黑话: {', '.join(found_jargon)}")
+                issue_types.append('jargon')
                 score -= 5
 
             # 检查绝对化表达
-            absolutes = self.creative_config.get('avoid_absolutes', {})
-            found_absolute = [k for k in absolutes if k in text]
+            found = self._find_absolutes(text)
+            found_absolute = [k for k in self._absolutes_keys if k in found]
             if found_absolute:
                 issues.append(f"发现绝对化表达: {', '.join(found_absolute)}")
+                issue_types.append('absolute')
                 score -= 3
 
             # 检查口语化程度
-            colloquial = self.creative_config.get('colloquial_style', {})
-            colloquial_phrases = (
-                colloquial.get('opening', []) +
-                colloquial.get('personal_touch', []) +
-                colloquial.get('uncertainty', [])
-            )
-            has_colloquial = any(p in text for p in colloquial_phrases)
-            if not has_colloquial:
+            if not self._find_colloquial(text):
                 issues.append("缺少口语化表达")
+                issue_types.append('no_colloquial')
                 score -= 10
 
         else:
             # 严谨模式质量检查
             # 检查夸大表达
-            avoid = self.formal_config.get('avoid_exaggeration', {})
-            found_exaggerated = [k for k in avoid if k in text]
+            found = self._find_exaggeration(text)
+            found_exaggerated = [k for k in self._exaggeration_keys if k in found]
             if found_exaggerated:
                 issues.append(f"发现夸大表达: {', '.join(found_exaggerated)}")
+                issue_types.append('exaggeration')
                 score -= 10
 
             # 检查数据是否标注来源
-            has_data = bool(re.search(r'\d+[％%]', text) or re.search(r'\d+万', text))
+            has_data = DATA_PATTERN.search(text) is not None
             if has_data and '约' not in text and '左右' not in text:
                 issues.append("数据缺少不确定性标注")
+                issue_types.append('no_uncertainty')
                 score -= 5
 
             # 检查是否有风险提示
-            if '收益' in text or '回报' in text:
-                if '风险' not in text:
-                    issues.append("缺少风险提示")
-                    score -= 15
+            if '风险' not in text and RISK_KEYWORD_PATTERN.search(text):
+                issues.append("缺少风险提示")
+                issue_types.append('no_risk')
+                score -= 15
 
         return {
             'score': max(0, score),
             'issues': issues,
+            'issue_types': issue_types,
             'passed': score >= 70,
             'mode': effective_mode
         }
@@ -313,27 +638,24 @@ class DeAIifier:
             改进建议列表
         """
         effective_mode = mode or self._determine_mode()
-        suggestions = []
         quality = self.check_quality(text, effective_mode)
 
-        if not quality['passed']:
-            for issue in quality['issues']:
-                if '营销黑话' in issue or '绝对化' in issue:
-                    suggestions.append("替换为更自然的口语化表达")
-                if '缺少口语化' in issue:
-                    suggestions.append("加入个人感受表达，如'我觉得''说实话'")
-                if '夸大表达' in issue:
-                    suggestions.append("使用更准确客观的表述，避免夸大")
-                if '缺少不确定性' in issue:
-                    suggestions.append("为数据添加'约''左右'等不确定性标注")
-                if '缺少风险提示' in issue:
-                    suggestions.append("添加风险提示说明")
-
-        return suggestions
+        if quality['passed']:
+            return []
+        return [ISSUE_SUGGESTIONS[issue_type] for issue_type in quality['issue_types']]
 
 
 # ==================== 便捷函数 ====================
 
+@lru_cache(maxsize=8)
+def _get_processor(
+    config_path: Optional[str] = None,
+    mode: Literal["creative", "formal", "auto"] = "auto"
+) -> DeAIifier:
+    """获取缓存的处理器，避免每次调用都重新加载配置"""
+    return DeAIifier(config_path, mode=mode)
+
+
 def deaiify(
     text: str,
     mode: Literal["creative", "formal"] = "creative",
@@ -360,7 +682,7 @@ def deaiify(
         >>> deaiify(text, mode="formal")
         '该项目具有主要优势，预计6个月左右回本。\\n\\n**风险提示**: 以上数据为估算值...'
     """
-    processor = DeAIifier(config_path, mode=mode)
+    processor = _get_processor(config_path, mode)
     return processor.process(text)
 
 
@@ -380,7 +702,7 @@ def check_text_quality(
     Returns:
         质量检查结果
     """
-    processor = DeAIifier(config_path)
+    processor = _get_processor(config_path)
     return processor.check_quality(text, mode)
 
 
@@ -13,7 +13,15 @@ from .registry import (
     register_agent
 )
 
-from .api import LeoAPI, leo
+from .api import LeoAPI, get_leo
+
+
+def __getattr__(name: str):
+    """leo 全局实例延迟到首次访问时创建，导入包时不做自动发现"""
+    if name == "leo":
+        return get_leo()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'UnifiedRegistry',
@@ -23,5 +31,6 @@ __all__ = [
     'register_skill',
     'register_agent',
     'LeoAPI',
+    'get_leo',
     'leo',
 ]
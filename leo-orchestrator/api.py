@@ -9,9 +9,18 @@ Leo统一API
 - 统一调用，一个接口处理所有
 """
 
+from collections import Counter
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from .registry import UnifiedRegistry, get_registry, SkillRegistration, AgentRegistration
+from typing import List, Dict, Any, Optional, Callable
+from .registry import UnifiedRegistry, get_registry
+
+
+def _dispatch(table: Dict[str, Callable], what: str) -> Optional[Callable]:
+    """按类型名查找处理方法，小写名直接命中，其他大小写写法再转小写查找"""
+    fn = table.get(what)
+    if fn is None:
+        fn = table.get(what.lower())
+    return fn
 
 
 class LeoAPI:
@@ -34,6 +43,22 @@ class LeoAPI:
         self.base_path = Path(base_path)
         self.registry = get_registry()
 
+        # 按类型分派到注册表方法（键为小写，调用时先按原样查找，未命中再转小写）
+        self._register_dispatch = {
+            "skill": self.registry.register_skill,
+            "agent": self.registry.register_agent,
+        }
+        self._list_dispatch = {
+            "skills": self.registry.list_skills,
+            "agents": self.registry.list_agents,
+        }
+        self._get_dispatch = {
+            "skill": self.registry.get_skill,
+            "agent": self.registry.get_agent,
+        }
+        self._enable_dispatch = {"skill": self.registry.enable_skill}
+        self._disable_dispatch = {"skill": self.registry.disable_skill}
+
         # 自动发现和注册
         self._auto_init()
 
@@ -62,13 +87,11 @@ class LeoAPI:
                         type="executor",
                         priority=1)
         """
-        if what.lower() == "skill":
-            return self.registry.register_skill(name=name, **kwargs)
-        elif what.lower() == "agent":
-            return self.registry.register_agent(name=name, **kwargs)
-        else:
+        fn = _dispatch(self._register_dispatch, what)
+        if fn is None:
             print(f"❌ 未知类型: {what}，必须是 'skill' 或 'agent'")
             return False
+        return fn(name=name, **kwargs)
 
     # ==================== 自动发现 ====================
 
@@ -109,12 +132,8 @@ class LeoAPI:
             # 列出所有Agents
             api.list("agents")
         """
-        if what.lower() == "skills":
-            return self.registry.list_skills(**filters)
-        elif what.lower() == "agents":
-            return self.registry.list_agents(**filters)
-        else:
-            return []
+        fn = _dispatch(self._list_dispatch, what)
+        return fn(**filters) if fn is not None else []
 
     def get(self, what: str, name: str) -> Optional[Any]:
         """
@@ -127,25 +146,20 @@ class LeoAPI:
         Returns:
             注册对象或None
         """
-        if what.lower() == "skill":
-            return self.registry.get_skill(name)
-        elif what.lower() == "agent":
-            return self.registry.get_agent(name)
-        return None
+        fn = _dispatch(self._get_dispatch, what)
+        return fn(name) if fn is not None else None
 
     # ==================== 启用/禁用 ====================
 
     def enable(self, what: str, name: str) -> bool:
         """启用Skill或Agent"""
-        if what.lower() == "skill":
-            return self.registry.enable_skill(name)
-        return False
+        fn = _dispatch(self._enable_dispatch, what)
+        return fn(name) if fn is not None else False
 
     def disable(self, what: str, name: str) -> bool:
         """禁用Skill或Agent"""
-        if what.lower() == "skill":
-            return self.registry.disable_skill(name)
-        return False
+        fn = _dispatch(self._disable_dispatch, what)
+        return fn(name) if fn is not None else False
 
     # ==================== 调用API ====================
 
@@ -271,19 +285,31 @@ class LeoAPI:
         Returns:
             包含统计信息的字典
         """
-        enabled_skills = [s for s in self.registry.skills.values() if s.enabled]
-        enabled_agents = [a for a in self.registry.agents.values() if a.enabled]
+        # 单次遍历同时完成启用计数和分组统计
+        enabled_skill_count = 0
+        by_category = Counter()
+        for skill in self.registry.skills.values():
+            if skill.enabled:
+                enabled_skill_count += 1
+                by_category[skill.category] += 1
+
+        enabled_agent_count = 0
+        by_type = Counter()
+        for agent in self.registry.agents.values():
+            if agent.enabled:
+                enabled_agent_count += 1
+                by_type[agent.type] += 1
 
         return {
             "skills": {
                 "total": len(self.registry.skills),
-                "enabled": len(enabled_skills),
-                "by_category": self._group_by_category(enabled_skills)
+                "enabled": enabled_skill_count,
+                "by_category": dict(by_category)
             },
             "agents": {
                 "total": len(self.registry.agents),
-                "enabled": len(enabled_agents),
-                "by_type": self._group_by_type(enabled_agents)
+                "enabled": enabled_agent_count,
+                "by_type": dict(by_type)
             },
             "workflows": {
                 "total": len(self.registry.workflows),
@@ -291,25 +317,26 @@ class LeoAPI:
             }
         }
 
-    def _group_by_category(self, skills: List[SkillRegistration]) -> Dict[str, int]:
-        """按分类统计Skills"""
-        result = {}
-        for skill in skills:
-            result[skill.category] = result.get(skill.category, 0) + 1
-        return result
 
-    def _group_by_type(self, agents: List[AgentRegistration]) -> Dict[str, int]:
-        """按类型统计Agents"""
-        result = {}
-        for agent in agents:
-            result[agent.type] = result.get(agent.type, 0) + 1
-        return result
+# ==================== 全局实例 ====================
+
+# 全局API实例在首次访问 leo 时才创建（创建时会扫描 leo-skills 目录），导入模块本身不触发自动发现
+_global_leo: Optional[LeoAPI] = None
 
 
-# ==================== 全局实例 ====================
+def get_leo() -> LeoAPI:
+    """获取全局API单例"""
+    global _global_leo
+    if _global_leo is None:
+        _global_leo = LeoAPI()
+    return _global_leo
+
 
-# 创建全局API实例
-leo = LeoAPI()
+def __getattr__(name: str):
+    """模块级属性 leo 按需创建（PEP 562）"""
+    if name == "leo":
+        return get_leo()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ==================== 极简使用示例 ====================
@@ -320,6 +347,7 @@ def example_usage():
     =========
     展示如何使用Leo API
     """
+    leo = get_leo()
 
     # ========== 1. 查询已注册的内容 ==========
 
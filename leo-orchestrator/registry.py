@@ -6,6 +6,7 @@ Leo统一注册表
 提供统一的注册、发现和调用接口
 """
 
+import logging
 import os
 import yaml
 from pathlib import Path
@@ -13,8 +14,16 @@ from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass, field
 from datetime import datetime
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML 未编译 libyaml 时退化为纯 Python 解析器
+    from yaml import SafeLoader
 
-@dataclass
+# 逐条注册信息记为 DEBUG，默认不输出；重复注册、配置缺失等记为 WARNING
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class SkillRegistration:
     """Skill注册信息"""
     name: str
@@ -29,7 +38,7 @@ class SkillRegistration:
         return f"{status} {self.name} ({self.category})"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentRegistration:
     """Subagent注册信息"""
     name: str
@@ -52,11 +61,18 @@ class UnifiedRegistry:
     管理所有Skills和Subagents的注册、发现和调用
     """
 
+    __slots__ = ('skills', 'agents', 'workflows', '_sorted_skills', '_sorted_agents')
+
     def __init__(self, config_path: Optional[str] = None):
         self.skills: Dict[str, SkillRegistration] = {}
         self.agents: Dict[str, AgentRegistration] = {}
         self.workflows: Dict[str, dict] = {}
 
+        # 按名称排序的Skills、按优先级排序的Agents，注册或注销时置空，下次查询时重新排序
+        # （注册后的 name、priority 视为不变）
+        self._sorted_skills: Optional[List[SkillRegistration]] = None
+        self._sorted_agents: Optional[List[AgentRegistration]] = None
+
         if config_path:
             self.load_from_config(config_path)
         else:
@@ -83,7 +99,7 @@ class UnifiedRegistry:
             )
         """
         if name in self.skills:
-            print(f"⚠️  Skill '{name}' 已存在，跳过注册")
+            logger.warning("⚠️  Skill '%s' 已存在，跳过注册", name)
             return False
 
         registration = SkillRegistration(
@@ -94,14 +110,16 @@ class UnifiedRegistry:
             metadata=metadata
         )
         self.skills[name] = registration
-        print(f"✅ 注册Skill: {registration}")
+        self._sorted_skills = None
+        logger.debug("✅ 注册Skill: %s", registration)
         return True
 
     def unregister_skill(self, name: str) -> bool:
         """注销一个Skill"""
         if name in self.skills:
             del self.skills[name]
-            print(f"❌ 注销Skill: {name}")
+            self._sorted_skills = None
+            logger.debug("❌ 注销Skill: %s", name)
             return True
         return False
 
@@ -111,10 +129,11 @@ class UnifiedRegistry:
 
     def list_skills(self, category: Optional[str] = None) -> List[SkillRegistration]:
         """列出所有Skills（可按分类筛选）"""
-        skills = list(self.skills.values())
+        if self._sorted_skills is None:
+            self._sorted_skills = sorted(self.skills.values(), key=lambda x: x.name)
         if category:
-            skills = [s for s in skills if s.category == category]
-        return sorted(skills, key=lambda x: x.name)
+            return [s for s in self._sorted_skills if s.category == category]
+        return list(self._sorted_skills)
 
     def enable_skill(self, name: str) -> bool:
         """启用Skill"""
@@ -151,7 +170,7 @@ class UnifiedRegistry:
             )
         """
         if name in self.agents:
-            print(f"⚠️  Agent '{name}' 已存在，跳过注册")
+            logger.warning("⚠️  Agent '%s' 已存在，跳过注册", name)
             return False
 
         registration = AgentRegistration(
@@ -163,14 +182,16 @@ class UnifiedRegistry:
             metadata=metadata
         )
         self.agents[name] = registration
-        print(f"✅ 注册Agent: {registration}")
+        self._sorted_agents = None
+        logger.debug("✅ 注册Agent: %s", registration)
         return True
 
     def unregister_agent(self, name: str) -> bool:
         """注销一个Agent"""
         if name in self.agents:
             del self.agents[name]
-            print(f"❌ 注销Agent: {name}")
+            self._sorted_agents = None
+            logger.debug("❌ 注销Agent: %s", name)
             return True
         return False
 
@@ -180,21 +201,22 @@ class UnifiedRegistry:
 
     def list_agents(self, type: Optional[str] = None) -> List[AgentRegistration]:
         """列出所有Agents（可按类型筛选）"""
-        agents = list(self.agents.values())
+        if self._sorted_agents is None:
+            self._sorted_agents = sorted(self.agents.values(), key=lambda x: x.priority)
         if type:
-            agents = [a for a in agents if a.type == type]
-        return sorted(agents, key=lambda x: x.priority)
+            return [a for a in self._sorted_agents if a.type == type]
+        return list(self._sorted_agents)
 
     # ==================== Workflows注册 ====================
 
     def register_workflow(self, name: str, workflow: dict) -> bool:
         """注册一个Workflow"""
         if name in self.workflows:
-            print(f"⚠️  Workflow '{name}' 已存在，跳过注册")
+            logger.warning("⚠️  Workflow '%s' 已存在，跳过注册", name)
             return False
 
         self.workflows[name] = workflow
-        print(f"✅ 注册Workflow: {name}")
+        logger.debug("✅ 注册Workflow: %s", name)
         return True
 
     def get_workflow(self, name: str) -> Optional[dict]:
@@ -211,33 +233,22 @@ class UnifiedRegistry:
         """
         自动发现并注册所有Skills
 
-        扫描leo-skills目录，自动注册所有*-cskill目录
+        扫描leo-skills目录，自动注册所有*-cskill目录（目录未变化时复用上次的扫描结果）
         """
         base = Path(base_path)
         discovered = 0
 
-        # 扫描所有分类目录
-        for category_dir in base.iterdir():
-            if not category_dir.is_dir() or category_dir.name.startswith('.'):
-                continue
-
-            category = category_dir.name
-
-            # 扫描该分类下的所有Skills
-            for skill_dir in category_dir.iterdir():
-                if skill_dir.is_dir() and skill_dir.name.endswith('-cskill'):
-                    skill_name = skill_dir.name
-
-                    # 检查是否已注册
-                    if skill_name not in self.skills:
-                        self.register_skill(
-                            name=skill_name,
-                            path=str(skill_dir.relative_to(base.parent)),
-                            category=category
-                        )
-                        discovered += 1
-
-        print(f"🔍 自动发现并注册了 {discovered} 个Skills")
+        for skill_name, skill_path, category in _discover_skill_dirs(base):
+            # 检查是否已注册
+            if skill_name not in self.skills:
+                self.register_skill(
+                    name=skill_name,
+                    path=skill_path,
+                    category=category
+                )
+                discovered += 1
+
+        logger.info("🔍 自动发现并注册了 %d 个Skills", discovered)
         return discovered
 
     # ==================== 配置加载 ====================
@@ -247,11 +258,11 @@ class UnifiedRegistry:
         config_file = Path(config_path)
 
         if not config_file.exists():
-            print(f"⚠️  配置文件不存在: {config_path}")
+            logger.warning("⚠️  配置文件不存在: %s", config_path)
             return
 
         with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=SafeLoader)
 
         # 加载Skills配置
         if 'skills' in config:
@@ -306,6 +317,53 @@ class UnifiedRegistry:
         print("\n" + "="*60 + "\n")
 
 
+# ==================== 自动发现缓存 ====================
+
+# 自动发现的扫描结果，按 (目录参数, 绝对路径) 缓存：
+# (各目录的 (路径, 修改时间), [(Skill名称, 相对路径, 分类), ...])
+# 目录中增删、重命名子目录会更新该目录的修改时间，各目录修改时间不变时直接复用结果
+_DISCOVERY_CACHE: Dict[tuple, tuple] = {}
+
+
+def _discover_skill_dirs(base: Path) -> List[tuple]:
+    """扫描 base 下各分类目录中的 *-cskill 目录，返回 [(Skill名称, 相对路径, 分类), ...]"""
+    key = (str(base), os.path.abspath(base))
+    cached = _DISCOVERY_CACHE.get(key)
+    if cached is not None:
+        dir_mtimes, found = cached
+        try:
+            if all(os.stat(path).st_mtime_ns == mtime_ns for path, mtime_ns in dir_mtimes):
+                return found
+        except OSError:
+            pass
+
+    # 先记录目录的修改时间再列出内容，扫描期间发生的变化会在下次调用时重新扫描
+    dir_mtimes = [(str(base), os.stat(base).st_mtime_ns)]
+    found = []
+
+    # 相对路径以 base 的目录名开头（即相对于 base.parent）
+    prefix = base.name
+
+    # 扫描所有分类目录（os.scandir 的 is_dir() 直接使用目录项中的类型信息，不必逐个 stat）
+    with os.scandir(base) as category_entries:
+        for category_entry in category_entries:
+            if not category_entry.is_dir() or category_entry.name.startswith('.'):
+                continue
+
+            category = category_entry.name
+            dir_mtimes.append((category_entry.path, category_entry.stat().st_mtime_ns))
+
+            # 扫描该分类下的所有Skills
+            with os.scandir(category_entry.path) as skill_entries:
+                for skill_entry in skill_entries:
+                    if skill_entry.name.endswith('-cskill') and skill_entry.is_dir():
+                        skill_name = skill_entry.name
+                        found.append((skill_name, os.path.join(prefix, category, skill_name), category))
+
+    _DISCOVERY_CACHE[key] = (tuple(dir_mtimes), found)
+    return found
+
+
 # ==================== 全局单例 ====================
 
 _global_registry: Optional[UnifiedRegistry] = None
@@ -365,6 +423,9 @@ def register_agent(**kwargs):
 # ==================== 使用示例 ====================
 
 if __name__ == "__main__":
+    # 示例中输出逐条注册信息
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     # 创建注册表
     registry = UnifiedRegistry()
 
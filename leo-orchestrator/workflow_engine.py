@@ -25,6 +25,8 @@ class WorkflowEngine:
     - 执行状态跟踪
     """
 
+    __slots__ = ('agents', 'execution_history')
+
     def __init__(self, agents: Dict[str, Any]):
         """
         初始化工作流引擎
@@ -126,17 +128,16 @@ class WorkflowEngine:
         if not agent:
             raise ValueError(f"Agent不存在: {agent_name}")
 
-        # 构造任务描述
-        task = context.get('task', step_name)
-
-        # 从context中移除task，避免重复传递
-        context_copy = context.copy()
-        context_copy.pop('task', None)
-
-        # 执行Agent
-        result = agent.execute(task, **context_copy)
+        # 上下文中没有task时以步骤名作为任务描述
+        if 'task' not in context:
+            return agent.execute(step_name, **context)
 
-        return result
+        # 执行期间暂时从context中移除task，避免重复传递，也免去复制整个context
+        task = context.pop('task')
+        try:
+            return agent.execute(task, **context)
+        finally:
+            context['task'] = task
 
     def _generate_final_result(self,
                                workflow_name: str,
@@ -4,11 +4,18 @@
 Content Layout Skill - 智能内容排版技能（可进化版本）
 """
 
+import os
 import sys
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML 未编译 libyaml 时退化为纯 Python 解析器
+    from yaml import SafeLoader
+
 # 添加leo-skills到路径
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
@@ -17,6 +24,13 @@ from formatters.wechat_formatter import WeChatFormatter
 from image_matchers.intelligent_matcher import ImageMatcher
 
 
+@lru_cache(maxsize=4)
+def _load_yaml_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """按 (路径, 修改时间) 缓存解析结果，文件修改后自动重新加载（返回共享对象，只读使用）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+
 class ContentLayoutSkill(EvolvableSkill):
     """智能内容排版技能"""
 
@@ -44,12 +58,13 @@ class ContentLayoutSkill(EvolvableSkill):
             }
 
     def load_config(self) -> Dict[str, Any]:
-        """加载配置"""
+        """加载配置（缓存的共享对象，只读使用）"""
         config_path = self.config_dir / "style_profiles.yaml"
-        if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
-        return {}
+        try:
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        return _load_yaml_cached(str(config_path), mtime_ns)
 
     def format_for_wechat(self, content: str, style: str = "data_driven",
                           title: Optional[str] = None, author: str = "Leo") -> Dict[str, Any]:
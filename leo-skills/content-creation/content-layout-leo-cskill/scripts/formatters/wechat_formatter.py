@@ -5,24 +5,90 @@
 Author: Leo Liu
 """
 
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 import re
 
 
+# 样式配置键名到CSS属性名的映射，未列出的键把下划线换成连字符
+_CSS_KEY_MAP = {
+    "font_size": "font-size",
+    "font_weight": "font-weight",
+    "color": "color",
+    "line_height": "line-height",
+    "background": "background",
+    "padding": "padding",
+    "margin": "margin",
+    "border_radius": "border-radius",
+    "border_left": "border-left",
+    "border_bottom": "border-bottom",
+    "padding_bottom": "padding-bottom",
+    "padding_left": "padding-left",
+    "text_align": "text-align",
+    "text_transform": "text-transform",
+    "letter_spacing": "letter-spacing",
+    "margin_top": "margin-top",
+    "margin_bottom": "margin-bottom",
+}
+
+
+# 高亮内容标记，合成一个正则一次扫描
+_HIGHLIGHT_INDICATORS = ["**", "我想说的是", "说实话", "数据不会骗人"]
+_HIGHLIGHT_RE = re.compile("|".join(map(re.escape, _HIGHLIGHT_INDICATORS)))
+
+
+@lru_cache(maxsize=32)
+def _page_css(body_color: str, body_line_height: str) -> str:
+    """生成页面CSS，只与正文颜色和行高有关，相同取值复用同一个字符串"""
+    return f'''
+<style>
+    body {{
+        font-family: -apple-system, BlinkMacSystemFont, "Helvetica Neue", Arial, sans-serif;
+        max-width: 677px;
+        margin: 0 auto;
+        padding: 20px;
+        color: {body_color};
+        line-height: {body_line_height};
+    }}
+    .content {{
+        margin: 20px 0;
+    }}
+    img {{
+        max-width: 100%;
+        height: auto;
+        display: block;
+        margin: 15px 0;
+        border-radius: 4px;
+    }}
+    .meta {{
+        color: #999999;
+        font-size: 14px;
+        margin: 10px 0;
+    }}
+</style>
+'''
+
+
 class WeChatFormatter:
     """微信公众号格式化器"""
 
     def __init__(self, style_config: Dict[str, Any]):
         self.style_config = style_config
 
+        # 按名称索引样式（同名时取第一个），找不到时使用第一个样式
+        styles = style_config.get("styles", [])
+        self._styles_by_name: Dict[Any, Dict[str, Any]] = {}
+        for style in styles:
+            self._styles_by_name.setdefault(style.get("name"), style)
+        self._default_style = styles[0] if styles else {}
+
     def format(self, content: str, style_name: str = "data_driven",
-              title: str = None, author: str = None) -> str:
+              title: Optional[str] = None, author: Optional[str] = None) -> str:
         """格式化为微信公众号格式"""
         style = self._get_style(style_name)
         sections = self._parse_sections(content)
         
-        html_parts = []
-        html_parts.append(self._generate_css(style))
+        html_parts = [self._generate_css(style)]
         
         if title:
             html_parts.append(self._format_title(title, style))
@@ -31,11 +97,7 @@ class WeChatFormatter:
             html_parts.append(f'<p class="meta">作者：{author}</p>')
         
         html_parts.append('<section class="content">')
-        
-        for section in sections:
-            formatted_section = self._format_section(section, style)
-            html_parts.append(formatted_section)
-        
+        html_parts.extend([self._format_section(section, style) for section in sections])
         html_parts.append('</section>')
         html_parts.append(self._format_footer(style))
         
@@ -43,15 +105,11 @@ class WeChatFormatter:
 
     def _get_style(self, style_name: str) -> Dict[str, Any]:
         """获取样式配置"""
-        styles = self.style_config.get("styles", [])
-        for style in styles:
-            if style.get("name") == style_name:
-                return style
-        return styles[0] if styles else {}
+        return self._styles_by_name.get(style_name, self._default_style)
 
-    def _parse_sections(self, content: str) -> List[Dict[str, Any]]:
-        """解析内容章节"""
-        sections = []
+    def _parse_sections(self, content: str) -> List[Tuple]:
+        """解析内容章节，返回 ("heading", 级别, 标题) 或 ("body", 段落) 元组列表"""
+        sections: List[Tuple] = []
         lines = content.split('\n')
         
         for line in lines:
@@ -60,38 +118,28 @@ class WeChatFormatter:
                 continue
             
             # 检测标题（支持# 和##）
-            if line.startswith('#'):
-                heading_level = len(line) - len(line.lstrip('#'))
-                heading_text = line.lstrip('#').strip()
-                sections.append({
-                    "type": "heading",
-                    "level": heading_level,
-                    "title": heading_text,
-                    "content": heading_text
-                })
+            if line[0] == '#':
+                heading_text = line.lstrip('#')
+                sections.append(("heading", len(line) - len(heading_text), heading_text.strip()))
             else:
                 # 普通段落
-                sections.append({
-                    "type": "body",
-                    "content": line
-                })
+                sections.append(("body", line))
         
         return sections
 
-    def _format_section(self, section: Dict[str, Any], style: Dict[str, Any]) -> str:
+    def _format_section(self, section: Tuple, style: Dict[str, Any]) -> str:
         """格式化章节"""
-        section_type = section.get("type", "body")
+        section_type = section[0]
         typography = style.get("typography", {})
         
         if section_type == "heading":
-            level = section.get("level", 2)
-            title = section.get("title", "")
+            _, level, title = section
             heading_style = typography.get("heading", {})
             styles = self._build_css(heading_style)
             return f'<h{level} style="{styles}">{title}</h{level}>'
         
         elif section_type == "body":
-            content = section.get("content", "")
+            content = section[1]
             body_style = typography.get("body", {})
             
             # 检测是否为高亮内容
@@ -105,7 +153,7 @@ class WeChatFormatter:
 
     def _is_highlight(self, text: str) -> bool:
         """判断是否为高亮内容"""
-        return any(indicator in text for indicator in ["**", "我想说的是", "说实话", "数据不会骗人"])
+        return _HIGHLIGHT_RE.search(text) is not None
 
     def _format_title(self, title: str, style: Dict[str, Any]) -> str:
         """格式化标题"""
@@ -134,74 +182,11 @@ class WeChatFormatter:
         body_color = typography.get("body", {}).get("color", "#333333")
         body_line_height = typography.get("body", {}).get("line_height", "1.8")
         
-        return f'''
-<style>
-    body {{
-        font-family: -apple-system, BlinkMacSystemFont, "Helvetica Neue", Arial, sans-serif;
-        max-width: 677px;
-        margin: 0 auto;
-        padding: 20px;
-        color: {body_color};
-        line-height: {body_line_height};
-    }}
-    .content {{
-        margin: 20px 0;
-    }}
-    img {{
-        max-width: 100%;
-        height: auto;
-        display: block;
-        margin: 15px 0;
-        border-radius: 4px;
-    }}
-    .meta {{
-        color: #999999;
-        font-size: 14px;
-        margin: 10px 0;
-    }}
-</style>
-'''
+        return _page_css(body_color, body_line_height)
 
     def _build_css(self, style_dict: Dict[str, Any]) -> str:
         """构建CSS字符串"""
-        css_parts = []
-        for key, value in style_dict.items():
-            if key == "font_size":
-                css_parts.append(f"font-size: {value}")
-            elif key == "font_weight":
-                css_parts.append(f"font-weight: {value}")
-            elif key == "color":
-                css_parts.append(f"color: {value}")
-            elif key == "line_height":
-                css_parts.append(f"line-height: {value}")
-            elif key == "background":
-                css_parts.append(f"background: {value}")
-            elif key == "padding":
-                css_parts.append(f"padding: {value}")
-            elif key == "margin":
-                css_parts.append(f"margin: {value}")
-            elif key == "border_radius":
-                css_parts.append(f"border-radius: {value}")
-            elif key == "border_left":
-                css_parts.append(f"border-left: {value}")
-            elif key == "border_bottom":
-                css_parts.append(f"border-bottom: {value}")
-            elif key == "padding_bottom":
-                css_parts.append(f"padding-bottom: {value}")
-            elif key == "padding_left":
-                css_parts.append(f"padding-left: {value}")
-            elif key == "text_align":
-                css_parts.append(f"text-align: {value}")
-            elif key == "text_transform":
-                css_parts.append(f"text-transform: {value}")
-            elif key == "letter_spacing":
-                css_parts.append(f"letter-spacing: {value}")
-            elif key == "margin_top":
-                css_parts.append(f"margin-top: {value}")
-            elif key == "margin_bottom":
-                css_parts.append(f"margin-bottom: {value}")
-            else:
-                css_key = key.replace('_', '-')
-                css_parts.append(f"{css_key}: {value}")
-        
-        return '; '.join(css_parts)
+        return '; '.join(
+            f"{_CSS_KEY_MAP.get(key) or key.replace('_', '-')}: {value}"
+            for key, value in style_dict.items()
+        )
@@ -1,13 +1,62 @@
 # Content Analyzer Module
 # 内容分析模块
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from bisect import bisect_right
+from functools import lru_cache
 import jieba
 import re
 from utils.logger import get_logger
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick 未安装时退化为纯 Python 扫描
+    ahocorasick = None
+
 logger = get_logger(__name__)
 
+# 趋势指示词
+TREND_INDICATORS = {
+    "上涨": ["上涨", "涨幅", "攀升", "走高", "普涨"],
+    "下跌": ["下跌", "跌幅", "下滑", "走低", "普跌"],
+    "回暖": ["回暖", "复苏", "反弹", "升温"],
+    "降温": ["降温", "遇冷", "下滑", "低迷"]
+}
+
+# 关键词分组
+KEYWORD_GROUPS = ("keyword", "policy", "positive", "negative", "trend", "region", "product")
+
+# 正负面关键词数量差的符号 (-1/0/1) -> 市场影响
+IMPACT_BY_SIGN = ("neutral", "positive", "negative")
+
+# 市场影响 -> 情感倾向
+SENTIMENT_MAP = {
+    "positive": "bullish",
+    "negative": "bearish",
+    "neutral": "neutral"
+}
+
+# 关键词 -> ((分组, 标签, 排序), ...) 的只读索引
+KeywordTags = Tuple[Tuple[str, Tuple[Tuple[str, str, int], ...]], ...]
+
+
+@lru_cache(maxsize=8)
+def _build_automaton(keyword_tags: KeywordTags):
+    """
+    构建 Aho-Corasick 自动机
+
+    按关键词索引内容缓存，相同关键词配置的分析器共享同一个自动机。
+    未安装 pyahocorasick 时返回 None。
+    """
+    if ahocorasick is None or not keyword_tags:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for keyword, entries in keyword_tags:
+        automaton.add_word(keyword, (keyword, entries))
+    automaton.make_automaton()
+    return automaton
+
 
 class ContentAnalyzer:
     """内容分析器"""
@@ -22,6 +71,13 @@ class ContentAnalyzer:
         self.keywords_config = keywords_config
         self.all_keywords = self._load_all_keywords()
 
+        # 关键词 -> ((分组, 标签, 排序), ...)，整篇文本只扫描一遍
+        self._keyword_tags = self._build_keyword_tags()
+        self._automaton = _build_automaton(self._keyword_tags)
+
+        # 句子分隔符
+        self._sentence_re = re.compile(r'[。！？；]')
+
     def _load_all_keywords(self) -> Dict[str, List[str]]:
         """加载所有关键词"""
         all_keywords = {}
@@ -34,6 +90,76 @@ class ContentAnalyzer:
                 all_keywords[category] = keywords
         return all_keywords
 
+    def _build_keyword_tags(self) -> KeywordTags:
+        """
+        汇总各分组关键词，标注所属分组
+
+        分组包括 keyword（全部关键词）、policy、positive、negative、
+        trend、region、product。排序值用于保持配置中的原始顺序。
+        """
+        policy_keywords = self.keywords_config.get("policy_keywords", {})
+        regional_keywords = self.keywords_config.get("regional_keywords", {})
+        product_keywords = self.keywords_config.get("product_keywords", {})
+
+        groups = [
+            ("policy", policy_keywords.get("primary", []) + policy_keywords.get("secondary", [])),
+            ("positive", self.keywords_config.get("positive_keywords", [])),
+            ("negative", self.keywords_config.get("negative_keywords", [])),
+            ("region", regional_keywords.get("cities", []) + regional_keywords.get("areas", [])),
+            ("product", product_keywords.get("primary", []) + product_keywords.get("secondary", [])),
+        ]
+
+        tags: Dict[str, List[Tuple[str, str, int]]] = {}
+        order = 0
+        for kw_list in self.all_keywords.values():
+            # keyword_weights 等非列表配置不参与匹配
+            if not isinstance(kw_list, list):
+                continue
+            for keyword in kw_list:
+                if isinstance(keyword, str) and keyword:
+                    tags.setdefault(keyword, []).append(("keyword", keyword, order))
+                    order += 1
+
+        for group, kw_list in groups:
+            for rank, keyword in enumerate(kw_list):
+                if isinstance(keyword, str) and keyword:
+                    tags.setdefault(keyword, []).append((group, keyword, rank))
+
+        for rank, (trend, indicators) in enumerate(TREND_INDICATORS.items()):
+            for indicator in indicators:
+                tags.setdefault(indicator, []).append(("trend", trend, rank))
+
+        return tuple((keyword, tuple(entries)) for keyword, entries in tags.items())
+
+    def _scan(self, text: str) -> Dict[str, Dict[str, int]]:
+        """
+        单次扫描文本，按分组收集命中的关键词
+
+        Returns:
+            {分组: {标签: 排序值}}
+        """
+        hits: Dict[str, Dict[str, int]] = {group: {} for group in KEYWORD_GROUPS}
+
+        # 先按关键词去重，同一关键词多次出现只处理一次
+        if self._automaton is not None:
+            matches = dict(value for _, value in self._automaton.iter(text))
+        else:
+            matches = {kw: entries for kw, entries in self._keyword_tags if kw in text}
+
+        for entries in matches.values():
+            for group, tag, rank in entries:
+                bucket = hits[group]
+                if tag not in bucket:
+                    bucket[tag] = rank
+
+        return hits
+
+    @staticmethod
+    def _ordered(hits: Dict[str, Dict[str, int]], group: str) -> List[str]:
+        """按配置顺序返回分组内命中的标签"""
+        bucket = hits[group]
+        return sorted(bucket, key=bucket.__getitem__)
+
     def analyze(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """
         分析单个信息项
@@ -45,133 +171,109 @@ class ContentAnalyzer:
             分析结果字典
         """
         text = item.get("title", "") + " " + item.get("content", "")
+        hits = self._scan(text)
+        impact = self._analyze_market_impact(text, hits)
 
         analysis = {
-            "policy_points": self._extract_policy_points(text),
-            "market_impact": self._analyze_market_impact(text),
-            "trends": self._identify_trends(text),
-            "sentiment": self._assess_sentiment(text),
-            "detected_keywords": self._detect_keywords(text),
-            "regions": self._detect_regions(text),
-            "products": self._detect_products(text)
+            "policy_points": self._extract_policy_points(text, hits),
+            "market_impact": impact,
+            "trends": self._ordered(hits, "trend"),
+            "sentiment": SENTIMENT_MAP[impact],
+            "detected_keywords": list(hits["keyword"]),
+            "regions": self._ordered(hits, "region"),
+            "products": self._ordered(hits, "product")
         }
 
         return analysis
 
-    def _extract_policy_points(self, text: str) -> List[str]:
+    def _extract_policy_points(self, text: str,
+                               hits: Optional[Dict[str, Dict[str, int]]] = None) -> List[str]:
         """提取政策要点"""
-        policy_points = []
-        policy_keywords = self.keywords_config.get("policy_keywords", {})
-
-        # 获取所有政策关键词
-        primary = policy_keywords.get("primary", [])
-        secondary = policy_keywords.get("secondary", [])
-        all_policy_keywords = set(primary + secondary)
-
-        # 使用正则表达式提取包含政策关键词的句子
-        sentences = re.split(r'[。！？；]', text)
-        for sentence in sentences:
-            for keyword in all_policy_keywords:
-                if keyword in sentence:
-                    policy_points.append(sentence.strip())
-                    break
-
-        return policy_points[:5]  # 返回最多5个要点
-
-    def _analyze_market_impact(self, text: str) -> str:
+        if hits is None:
+            hits = self._scan(text)
+
+        # 只需定位全文中出现过的政策关键词
+        matched = hits["policy"]
+        if not matched:
+            return []
+
+        # 一次扫描得到所有分隔符位置，再把关键词出现位置归属到句子
+        delimiters = [m.start() for m in self._sentence_re.finditer(text)]
+        sentence_ids = set()
+        for keyword in matched:
+            start = text.find(keyword)
+            while start != -1:
+                sentence_ids.add(bisect_right(delimiters, start))
+                start = text.find(keyword, start + 1)
+
+        bounds = [-1] + delimiters + [len(text)]
+        policy_points = [
+            text[bounds[i] + 1:bounds[i + 1]].strip()
+            for i in sorted(sentence_ids)[:5]
+        ]
+
+        return policy_points  # 返回最多5个要点
+
+    def _analyze_market_impact(self, text: str,
+                               hits: Optional[Dict[str, Dict[str, int]]] = None) -> str:
         """分析市场影响"""
-        positive_keywords = self.keywords_config.get("positive_keywords", [])
-        negative_keywords = self.keywords_config.get("negative_keywords", [])
+        if hits is None:
+            hits = self._scan(text)
 
-        positive_count = sum(1 for kw in positive_keywords if kw in text)
-        negative_count = sum(1 for kw in negative_keywords if kw in text)
+        positive_count = len(hits["positive"])
+        negative_count = len(hits["negative"])
 
-        if positive_count > negative_count:
-            return "positive"
-        elif negative_count > positive_count:
-            return "negative"
-        return "neutral"
+        return IMPACT_BY_SIGN[(positive_count > negative_count) - (negative_count > positive_count)]
 
-    def _identify_trends(self, text: str) -> List[str]:
+    def _identify_trends(self, text: str,
+                         hits: Optional[Dict[str, Dict[str, int]]] = None) -> List[str]:
         """识别趋势"""
-        trends = []
-        trend_indicators = {
-            "上涨": ["上涨", "涨幅", "攀升", "走高", "普涨"],
-            "下跌": ["下跌", "跌幅", "下滑", "走低", "普跌"],
-            "回暖": ["回暖", "复苏", "反弹", "升温"],
-            "降温": ["降温", "遇冷", "下滑", "低迷"]
-        }
-
-        for trend, indicators in trend_indicators.items():
-            if any(indicator in text for indicator in indicators):
-                trends.append(trend)
-
-        return trends
+        if hits is None:
+            hits = self._scan(text)
+        return self._ordered(hits, "trend")
 
-    def _assess_sentiment(self, text: str) -> str:
+    def _assess_sentiment(self, text: str,
+                          hits: Optional[Dict[str, Dict[str, int]]] = None) -> str:
         """评估情感倾向"""
-        impact = self._analyze_market_impact(text)
-
-        sentiment_map = {
-            "positive": "bullish",
-            "negative": "bearish",
-            "neutral": "neutral"
-        }
-
-        return sentiment_map.get(impact, "neutral")
-
-    def _detect_keywords(self, text: str) -> List[str]:
-        """检测文本中的关键词"""
-        detected = []
-
-        for category, keywords in self.all_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    detected.append(keyword)
-
-        return list(set(detected))
-
-    def _detect_regions(self, text: str) -> List[str]:
+        impact = self._analyze_market_impact(text, hits)
+        return SENTIMENT_MAP.get(impact, "neutral")
+
+    def _detect_keywords(self, text: str,
+                         hits: Optional[Dict[str, Dict[str, int]]] = None) -> List[str]:
+        """检测文本中的关键词（按首次匹配顺序，已去重）"""
+        if hits is None:
+            hits = self._scan(text)
+        return list(hits["keyword"])
+
+    def _detect_regions(self, text: str,
+                        hits: Optional[Dict[str, Dict[str, int]]] = None) -> List[str]:
         """检测提到的区域"""
-        regions = []
-        regional_keywords = self.keywords_config.get("regional_keywords", {})
-
-        cities = regional_keywords.get("cities", [])
-        areas = regional_keywords.get("areas", [])
-
-        for city in cities:
-            if city in text:
-                regions.append(city)
+        if hits is None:
+            hits = self._scan(text)
+        return self._ordered(hits, "region")
 
-        for area in areas:
-            if area in text:
-                regions.append(area)
-
-        return regions
-
-    def _detect_products(self, text: str) -> List[str]:
+    def _detect_products(self, text: str,
+                         hits: Optional[Dict[str, Dict[str, int]]] = None) -> List[str]:
         """检测提到的产品类型"""
-        products = []
-        product_keywords = self.keywords_config.get("product_keywords", {})
-
-        primary = product_keywords.get("primary", [])
-        secondary = product_keywords.get("secondary", [])
-
-        for product in primary + secondary:
-            if product in text:
-                products.append(product)
-
-        return products
+        if hits is None:
+            hits = self._scan(text)
+        return self._ordered(hits, "product")
 
     def batch_analyze(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """批量分析信息项"""
         results = []
         for item in items:
-            try:
-                analysis = self.analyze(item)
-                item["analysis"] = analysis
-                results.append(item)
-            except Exception as e:
-                logger.error(f"分析失败: {e}")
+            analysis = self._safe_analyze(item)
+            if analysis is None:
                 continue
+            item["analysis"] = analysis
+            results.append(item)
         return results
+
+    def _safe_analyze(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """分析单个信息项，失败时返回 None"""
+        try:
+            return self.analyze(item)
+        except Exception as e:
+            logger.error(f"分析失败: {e}")
+            return None
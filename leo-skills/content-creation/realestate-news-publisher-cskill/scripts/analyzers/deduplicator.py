@@ -3,28 +3,93 @@
 
 from typing import List, Dict, Any
 import hashlib
+import re
+from collections import OrderedDict
 from datetime import datetime
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import jieba
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
 from utils.logger import get_logger
 
+try:
+    import xxhash
+except ImportError:  # xxhash 未安装时使用标准库 blake2b
+    xxhash = None
+
 logger = get_logger(__name__)
 
 
+class RecentHashSet:
+    """容量有限的哈希集合，超出容量时淘汰最久未出现的哈希（精确判重，无误判）"""
+
+    def __init__(self, capacity: int = 1_000_000):
+        """
+        初始化哈希集合
+
+        Args:
+            capacity: 最多保留的哈希数量
+        """
+        self.capacity = max(1, capacity)
+        self._hashes: OrderedDict = OrderedDict()
+
+    def add(self, value: int):
+        """加入元素，超出容量时淘汰最久未出现的元素"""
+        hashes = self._hashes
+        if value in hashes:
+            hashes.move_to_end(value)
+            return
+
+        hashes[value] = None
+        if len(hashes) > self.capacity:
+            hashes.popitem(last=False)
+
+    def __contains__(self, value: int) -> bool:
+        hashes = self._hashes
+        if value in hashes:
+            # 再次出现的内容延后淘汰
+            hashes.move_to_end(value)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def clear(self):
+        """清空集合"""
+        self._hashes.clear()
+
+
 class Deduplicator:
     """内容去重器"""
 
-    def __init__(self, similarity_threshold: float = 0.85):
+    def __init__(self, similarity_threshold: float = 0.85, hash_capacity: int = 1_000_000):
         """
         初始化去重器
 
         Args:
             similarity_threshold: 相似度阈值（0-1）
+            hash_capacity: 最多保留的内容哈希数量
         """
         self.similarity_threshold = similarity_threshold
-        self.seen_hashes = set()
+        # 长时间运行时内存有上限，只淘汰最久未出现的哈希，不会误删新内容
+        self.seen_hashes = RecentHashSet(hash_capacity)
         self.seen_urls = set()
 
+        # URL 中常见的跟踪参数
+        self._tracking_re = re.compile(r'[?&](utm_|ref|share).*$', re.IGNORECASE)
+
+        # 无状态的哈希向量化器，无需逐批 fit，可跨批次复用
+        # 文本先经 jieba 分词并以空格连接，默认正则无法切分中文
+        self._vectorizer = HashingVectorizer(
+            tokenizer=str.split,
+            token_pattern=None,
+            n_features=2 ** 15,
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm='l2',
+            dtype=np.float32
+        )
+
     def deduplicate(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         去除重复和相似内容
@@ -37,30 +102,34 @@ class Deduplicator:
         """
         logger.info(f"开始去重，原始数量: {len(items)}")
 
-        # 第一阶段：URL 去重
-        unique_items = self._deduplicate_by_url(items)
-
-        # 第二阶段：内容哈希去重
-        unique_items = self._deduplicate_by_hash(unique_items)
+        # 第一阶段：URL 与内容哈希去重（单次遍历）
+        unique_items = self._deduplicate_by_url_and_hash(items)
 
-        # 第三阶段：相似内容去重
+        # 第二阶段：相似内容去重
         unique_items = self._deduplicate_by_similarity(unique_items)
 
         logger.info(f"去重完成，剩余数量: {len(unique_items)}")
 
         return unique_items
 
-    def _deduplicate_by_url(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """根据 URL 去重"""
+    def _deduplicate_by_url_and_hash(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """根据 URL 和内容哈希去重"""
+        seen_urls = self.seen_urls
+        seen_hashes = self.seen_hashes
         unique_items = []
         for item in items:
-            url = item.get("url", "")
             # 规范化 URL（移除尾部斜杠、查询参数等）
-            normalized_url = self._normalize_url(url)
+            normalized_url = self._normalize_url(item.get("url", ""))
+            if normalized_url in seen_urls:
+                continue
+            seen_urls.add(normalized_url)
+
+            content_hash = self._item_hash(item)
+            if content_hash in seen_hashes:
+                continue
+            seen_hashes.add(content_hash)
 
-            if normalized_url not in self.seen_urls:
-                self.seen_urls.add(normalized_url)
-                unique_items.append(item)
+            unique_items.append(item)
 
         return unique_items
 
@@ -69,31 +138,29 @@ class Deduplicator:
         if not url:
             return ""
 
-        # 移除尾部斜杠
-        url = url.rstrip("/")
+        # 移除尾部斜杠和常见的跟踪参数
+        return self._tracking_re.sub('', url.rstrip("/")).lower()
 
-        # 移除常见的跟踪参数
-        import re
-        url = re.sub(r'[?&](utm_|ref|share).*$', '', url)
-
-        return url.lower()
-
-    def _deduplicate_by_hash(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """根据内容哈希去重"""
-        unique_items = []
-        for item in items:
-            # 使用标题和部分内容生成哈希
-            title = item.get("title", "")
-            content = item.get("content", "")[:500]  # 只使用前500字符
-            combined = f"{title}{content}"
+    def _item_hash(self, item: Dict[str, Any]) -> int:
+        """使用标题和部分内容生成哈希"""
+        title = item.get("title", "")
+        content = item.get("content", "")[:500]  # 只使用前500字符
+        return self._content_hash(title, content)
 
-            content_hash = hashlib.md5(combined.encode('utf-8')).hexdigest()
+    @staticmethod
+    def _content_hash(title: str, content: str) -> int:
+        """计算 64 位内容哈希（非加密用途）"""
+        if xxhash is not None:
+            hasher = xxhash.xxh3_64()
+        else:
+            hasher = hashlib.blake2b(digest_size=8)
 
-            if content_hash not in self.seen_hashes:
-                self.seen_hashes.add(content_hash)
-                unique_items.append(item)
+        hasher.update(title.encode('utf-8'))
+        hasher.update(content.encode('utf-8'))
 
-        return unique_items
+        if xxhash is not None:
+            return hasher.intdigest()
+        return int.from_bytes(hasher.digest(), 'big')
 
     def _deduplicate_by_similarity(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """基于相似度去重"""
@@ -104,33 +171,30 @@ class Deduplicator:
         texts = []
         for item in items:
             text = item.get("title", "") + " " + item.get("content", "")[:500]
-            texts.append(text)
+            texts.append(self._tokenize(text))
 
-        # 计算TF-IDF和余弦相似度
+        # 计算词频向量和余弦相似度
         try:
-            vectorizer = TfidfVectorizer(
-                max_features=1000,
-                ngram_range=(1, 2),
-                stop_words=None  # 中文需要自定义停用词
-            )
-            tfidf_matrix = vectorizer.fit_transform(texts)
-            similarity_matrix = cosine_similarity(tfidf_matrix)
-
-            # 找出相似的文章并标记
+            tf_matrix = self._vectorizer.transform(texts)
+
+            # 向量已做 L2 归一化，稀疏矩阵乘积即余弦相似度
+            similarity = (tf_matrix @ tf_matrix.T).tocoo()
+            mask = (similarity.row < similarity.col) & (similarity.data >= self.similarity_threshold)
+            rows = similarity.row[mask]
+            cols = similarity.col[mask]
+
+            # 只遍历超过阈值的文章对，按 (i, j) 顺序保证与逐对比较结果一致
+            order = np.lexsort((cols, rows))
+
             to_remove = set()
-            for i in range(len(items)):
-                if i in to_remove:
+            for i, j in zip(rows[order].tolist(), cols[order].tolist()):
+                if i in to_remove or j in to_remove:
                     continue
-                for j in range(i + 1, len(items)):
-                    if j in to_remove:
-                        continue
-                    if similarity_matrix[i][j] >= self.similarity_threshold:
-                        # 保留优先级更高的
-                        if items[i].get("priority", 5) >= items[j].get("priority", 5):
-                            to_remove.add(j)
-                        else:
-                            to_remove.add(i)
-                            break
+                # 保留优先级更高的
+                if items[i].get("priority", 5) >= items[j].get("priority", 5):
+                    to_remove.add(j)
+                else:
+                    to_remove.add(i)
 
             unique_items = [item for i, item in enumerate(items) if i not in to_remove]
             return unique_items
@@ -139,6 +203,11 @@ class Deduplicator:
             logger.warning(f"相似度计算失败: {e}，跳过相似度去重")
             return items
 
+    @staticmethod
+    def _tokenize(text: str) -> str:
+        """中文分词，返回以空格分隔的词串"""
+        return " ".join(jieba.cut_for_search(text))
+
     def reset(self):
         """重置去重器状态"""
         self.seen_hashes.clear()
@@ -2,6 +2,7 @@
 # 相关性评分模块
 
 from typing import Dict, Any, List
+import numpy as np
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -23,6 +24,10 @@ class RelevanceScorer:
         """
         self.keywords_config = keywords_config
         self.keyword_weights = keywords_config.get("keyword_weights", {})
+        self._kw_weight = self._build_keyword_weight_index()
+
+        # 宁波及其区县
+        self._ningbo_regions = frozenset(["宁波", "余姚", "镇海", "奉化", "牟山", "九龙湖", "溪口"])
 
         # 默认优先级配置
         self.priority_config = priority_config or {
@@ -89,12 +94,39 @@ class RelevanceScorer:
         max_possible = len(detected_keywords) * 1.0
         return min(total_weight / max_possible, 1.0) if max_possible > 0 else 0.0
 
+    def _build_keyword_weight_index(self) -> Dict[str, float]:
+        """
+        构建 {关键词: 权重} 索引
+
+        权重键支持 policy_primary（分类_子分类）和 policy_keywords（整个分类）
+        两种写法；权重值大于 1 时视为 0-10 分制。
+        """
+        index = {}
+        for weight_key, weight in self.keyword_weights.items():
+            if not isinstance(weight, (int, float)):
+                continue
+            normalized = weight / 10.0 if weight > 1 else float(weight)
+
+            if weight_key.endswith("_keywords"):
+                keywords = self.keywords_config.get(weight_key, {})
+            else:
+                category, _, subcategory = weight_key.partition("_")
+                keywords = self.keywords_config.get(f"{category}_keywords", {})
+                keywords = keywords.get(subcategory, []) if isinstance(keywords, dict) else []
+
+            if isinstance(keywords, dict):
+                keywords = [kw for kw_list in keywords.values()
+                            if isinstance(kw_list, list) for kw in kw_list]
+
+            for keyword in keywords:
+                # 同一关键词以先出现的权重为准
+                index.setdefault(keyword, normalized)
+
+        return index
+
     def _find_keyword_weight(self, keyword: str) -> float:
         """查找关键词的权重"""
-        for category, weight in self.keyword_weights.items():
-            if keyword in str(self.keywords_config.get(category.replace("_keywords", ""), {})):
-                return weight / 10.0  # 标准化到 0-1
-        return 0.5  # 默认权重
+        return self._kw_weight.get(keyword, 0.5)  # 默认权重
 
     def _score_category(self, item: Dict[str, Any]) -> float:
         """根据分类评分"""
@@ -127,10 +159,7 @@ class RelevanceScorer:
         regions = analysis.get("regions", [])
 
         # 宁波及其区县得高分
-        ningbo_regions = ["宁波", "余姚", "镇海", "奉化", "牟山", "九龙湖", "溪口"]
-        has_ningbo_region = any(region in regions for region in ningbo_regions)
-
-        if has_ningbo_region:
+        if not self._ningbo_regions.isdisjoint(regions):
             return 1.0
         elif regions:
             return 0.5
@@ -148,20 +177,22 @@ class RelevanceScorer:
         Returns:
             过滤后的信息项列表
         """
-        scored_items = []
-
-        for item in items:
-            analysis = item.get("analysis")
-            if not analysis:
-                continue
-
-            score = self.score(item, analysis)
+        scorable = [item for item in items if item.get("analysis")]
+        if not scorable:
+            return []
+
+        # 得分保存为连续数组，过滤和排序都在 NumPy 中完成
+        # 使用 float64，避免 float32 舍入让边界得分落到阈值以下
+        scores = np.fromiter(
+            (self.score(item, item["analysis"]) for item in scorable),
+            dtype=np.float64,
+            count=len(scorable)
+        )
+        for item, score in zip(scorable, scores.tolist()):
             item["relevance_score"] = score
 
-            if score >= min_score:
-                scored_items.append(item)
-
-        # 按得分排序
-        scored_items.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
+        # 按得分降序排序，稳定排序保持同分项的原始顺序
+        keep = np.flatnonzero(scores >= min_score)
+        order = keep[np.argsort(-scores[keep], kind="stable")]
 
-        return scored_items
+        return [scorable[i] for i in order.tolist()]
@@ -1,6 +1,8 @@
 # Base Collector Module
 # 基础采集器模块
 
+import re
+import sys
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
@@ -8,12 +10,26 @@ from bs4 import BeautifulSoup
 from utils.http_client import HTTPClient
 from utils.logger import get_logger
 
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax 未安装时使用 BeautifulSoup 解析
+    HTMLParser = None
+
 logger = get_logger(__name__)
 
+# 清理 HTML 时移除的标签
+NOISE_TAGS = ["script", "style", "nav", "footer", "header"]
+
 
 class BaseCollector(ABC):
     """采集器基类"""
 
+    # 匹配 2024-01-02、2024/1/2、2024年1月2日，可带 HH:MM:SS
+    _date_re = re.compile(
+        r'(\d{4})[-/年](\d{1,2})[-/月](\d{1,2})日?'
+        r'(?:[ T](\d{1,2}):(\d{1,2}):(\d{1,2}))?'
+    )
+
     def __init__(self, config: Dict[str, Any], http_client: HTTPClient = None):
         """
         初始化采集器
@@ -25,7 +41,8 @@ class BaseCollector(ABC):
         self.config = config
         self.http_client = http_client or HTTPClient(
             timeout=config.get("timeout", 30),
-            rate_limit_delay=config.get("rate_limit_delay", 2)
+            rate_limit_delay=config.get("rate_limit_delay", 2),
+            rate_limit_jitter=config.get("rate_limit_jitter", 0)
         )
         self.name = config.get("name", "Unknown")
         self.url = config.get("url", "")
@@ -49,19 +66,23 @@ class BaseCollector(ABC):
 
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """解析日期字符串"""
-        date_formats = [
-            "%Y-%m-%d",
-            "%Y/%m/%d",
-            "%Y年%m月%d日",
-            "%Y-%m-%d %H:%M:%S",
-            "%Y/%m/%d %H:%M:%S",
-        ]
-
-        for fmt in date_formats:
+        date_str = date_str.strip()
+
+        match = self._date_re.fullmatch(date_str)
+        if match:
+            try:
+                return datetime(*(int(part) for part in match.groups(default="0")))
+            except ValueError:
+                pass
+        else:
+            # 其他 ISO 8601 写法（带时区、毫秒等）
             try:
-                return datetime.strptime(date_str.strip(), fmt)
+                parsed = datetime.fromisoformat(date_str)
+                if parsed.tzinfo is not None:
+                    parsed = parsed.astimezone().replace(tzinfo=None)
+                return parsed
             except ValueError:
-                continue
+                pass
 
         logger.warning(f"无法解析日期: {date_str}")
         return None
@@ -92,15 +113,16 @@ class BaseCollector(ABC):
             priority: 优先级
 
         Returns:
-            标准化的信息项字典
+            标准化的信息项字典（collected_at 为 ISO 格式时间字符串）
         """
+        # 来源和分类取值有限，驻留后所有信息项共享同一字符串对象
         return {
             "title": title.strip(),
             "url": url,
             "content": content.strip() if content else "",
             "publish_date": publish_date,
-            "source": source,
-            "category": category,
+            "source": sys.intern(source),
+            "category": sys.intern(category),
             "priority": priority or self.priority,
             "collected_at": datetime.now().isoformat()
         }
@@ -113,15 +135,32 @@ class BaseCollector(ABC):
 
     def clean_html(self, html: str) -> str:
         """清理 HTML，保留纯文本"""
+        if HTMLParser is not None:
+            tree = HTMLParser(html)
+            return self._clean_node(tree.body or tree.root)
+
         soup = BeautifulSoup(html, 'lxml')
 
         # 移除脚本和样式
-        for script in soup(["script", "style", "nav", "footer", "header"]):
+        for script in soup(NOISE_TAGS):
             script.decompose()
 
         # 获取文本
-        text = soup.get_text(separator="\n")
+        return self._strip_blank_lines(soup.get_text(separator="\n"))
+
+    def _clean_node(self, node) -> str:
+        """清理 selectolax 节点，保留纯文本"""
+        if node is None:
+            return ""
+
+        # 移除脚本和样式
+        for tag in node.css(", ".join(NOISE_TAGS)):
+            tag.decompose()
+
+        return self._strip_blank_lines(node.text(separator="\n"))
 
-        # 清理空白行
+    @staticmethod
+    def _strip_blank_lines(text: str) -> str:
+        """清理空白行"""
         lines = [line.strip() for line in text.splitlines() if line.strip()]
         return "\n".join(lines)
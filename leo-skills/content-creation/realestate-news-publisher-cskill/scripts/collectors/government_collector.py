@@ -1,15 +1,32 @@
 # Government Collector Module
 # 政府网站采集器模块
 
+import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-from .base_collector import BaseCollector
+from .base_collector import BaseCollector, HTMLParser
+from utils.http_client import HTTPClient
 from utils.logger import get_logger
 
+try:
+    import httpx
+except ImportError:  # httpx 未安装时逐条同步获取详情页
+    httpx = None
+
 logger = get_logger(__name__)
 
+# 常见的内容选择器
+CONTENT_SELECTORS = [
+    ".article-content",
+    ".content",
+    ".article-body",
+    "#content",
+    ".detail-content",
+    "article"
+]
+
 
 class GovernmentCollector(BaseCollector):
     """政府网站信息采集器"""
@@ -17,6 +34,8 @@ class GovernmentCollector(BaseCollector):
     def __init__(self, config: Dict[str, Any], http_client=None):
         super().__init__(config, http_client)
         self.region = config.get("region", "ningbo")
+        # 并发获取详情页的最大请求数；同一主机仍按 rate_limit_delay 间隔发送
+        self.max_concurrency = config.get("max_concurrency", 2)
 
     def collect(self, keywords: List[str] = None,
                 days_back: int = 7) -> List[Dict[str, Any]]:
@@ -51,26 +70,35 @@ class GovernmentCollector(BaseCollector):
             selectors = self.config.get("selectors", {})
             items = self._extract_items(soup, selectors)
 
-            # 处理每个信息项
+            # 处理每个信息项（先按日期过滤，再获取详情）
+            details = []
             for item in items:
                 try:
                     # 提取详细信息
-                    detail = self._extract_detail(item)
+                    detail = self._extract_detail(item, fetch_content=False)
 
                     # 检查日期
                     if not self._is_within_days(detail.get("publish_date"), days_back):
                         continue
 
-                    # 检查关键词匹配
-                    if keywords and not self._matches_keywords(detail, keywords):
-                        continue
-
-                    results.append(detail)
+                    details.append(detail)
 
                 except Exception as e:
                     logger.error(f"处理信息项失败: {e}")
                     continue
 
+            # 并发获取详细内容
+            contents = self._fetch_contents([detail["url"] for detail in details])
+
+            for detail, content in zip(details, contents):
+                detail["content"] = content.strip() if content else ""
+
+                # 检查关键词匹配
+                if keywords and not self._matches_keywords(detail, keywords):
+                    continue
+
+                results.append(detail)
+
             logger.info(f"从 {self.name} 采集到 {len(results)} 条信息")
 
         except Exception as e:
@@ -85,8 +113,14 @@ class GovernmentCollector(BaseCollector):
         items = soup.select(list_selector)
         return items[:20]  # 限制返回数量
 
-    def _extract_detail(self, item) -> Dict[str, Any]:
-        """从信息项提取详细信息"""
+    def _extract_detail(self, item, fetch_content: bool = True) -> Dict[str, Any]:
+        """
+        从信息项提取详细信息
+
+        Args:
+            item: 列表页中的信息项元素
+            fetch_content: 是否同步获取详情页内容
+        """
         selectors = self.config.get("selectors", {})
 
         # 提取标题和链接
@@ -106,7 +140,7 @@ class GovernmentCollector(BaseCollector):
 
         # 尝试获取详细内容
         content = ""
-        if full_url:
+        if fetch_content and full_url:
             content = self._fetch_content(full_url)
 
         return self._create_item(
@@ -123,25 +157,63 @@ class GovernmentCollector(BaseCollector):
         try:
             response = self.http_client.get(url)
             if response:
-                soup = BeautifulSoup(response.text, 'lxml')
-                # 常见的内容选择器
-                content_selectors = [
-                    ".article-content",
-                    ".content",
-                    ".article-body",
-                    "#content",
-                    ".detail-content",
-                    "article"
-                ]
-                for selector in content_selectors:
-                    elem = soup.select_one(selector)
-                    if elem:
-                        return self.clean_html(str(elem))
+                return self._extract_content(response.text)
+        except Exception as e:
+            logger.warning(f"获取详细内容失败 {url}: {e}")
+
+        return ""
+
+    def _fetch_contents(self, urls: List[str]) -> List[str]:
+        """批量获取详细页面内容，可用时并发请求"""
+        if httpx is not None and len(urls) > 1:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # 当前线程没有运行中的事件循环，可直接并发获取
+                return asyncio.run(self._fetch_contents_async(urls))
+
+        return [self._fetch_content(url) if url else "" for url in urls]
+
+    async def _fetch_contents_async(self, urls: List[str]) -> List[str]:
+        """通过 HTTP 客户端的异步接口并发获取详细页面内容（沿用其限流与重试）"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with HTTPClient.async_scope():
+            return await asyncio.gather(*(
+                self._fetch_content_async(semaphore, url) for url in urls
+            ))
+
+    async def _fetch_content_async(self, semaphore: asyncio.Semaphore, url: str) -> str:
+        """异步获取单个详细页面内容"""
+        if not url:
+            return ""
+
+        try:
+            async with semaphore:
+                response = await self.http_client.get_async(url)
+            if response:
+                return self._extract_content(response.text)
         except Exception as e:
             logger.warning(f"获取详细内容失败 {url}: {e}")
 
         return ""
 
+    def _extract_content(self, html: str) -> str:
+        """从详细页面 HTML 中提取正文"""
+        if HTMLParser is not None:
+            tree = HTMLParser(html)
+            for selector in CONTENT_SELECTORS:
+                elem = tree.css_first(selector)
+                if elem:
+                    return self._clean_node(elem)
+        else:
+            soup = BeautifulSoup(html, 'lxml')
+            for selector in CONTENT_SELECTORS:
+                elem = soup.select_one(selector)
+                if elem:
+                    return self.clean_html(str(elem))
+
+        return ""
+
     def _matches_keywords(self, item: Dict[str, Any],
                           keywords: List[str]) -> bool:
         """检查信息是否匹配关键词"""
@@ -1,11 +1,86 @@
 # Article Generator Module
 # 文章生成模块
 
-from typing import Dict, Any, List, Optional
+import asyncio
+import random
+import re
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 from utils.logger import get_logger
+from .llm_cache import LLMCache
+from .llm_guard import CircuitBreaker, RateLimiter, is_transient_error
 
 logger = get_logger(__name__)
 
+# 各类文章固定不变的系统提示词，作为稳定前缀便于服务端复用提示词缓存
+SYSTEM_PROMPTS = {
+    "policy": """你是一位专业的房地产内容创作者。请基于用户提供的信息撰写一篇微信公众号文章。
+
+【要求】
+1. 标题要吸引人，包含政策关键词
+2. 正文结构：引言 + 政策解读 + 市场影响 + 购房建议 + 结语
+3. 自然融入【推荐项目】中的项目信息
+4. 段落简短，适合手机阅读
+5. 专业但不晦涩，贴近购房者
+6. 字数800-1200字
+7. 使用 Markdown 格式""",
+    "market": """你是一位专业的房地产内容创作者。请基于用户提供的信息撰写一篇微信公众号文章。
+
+【要求】
+1. 标题要吸引人，包含市场关键词
+2. 正文结构：引言 + 市场现状 + 数据分析 + 购房建议 + 结语
+3. 自然融入【推荐项目】中的项目信息
+4. 段落简短，适合手机阅读
+5. 数据支撑，观点明确
+6. 字数800-1200字
+7. 使用 Markdown 格式""",
+    "regional": """你是一位专业的房地产内容创作者。请基于用户提供的信息撰写一篇微信公众号文章。
+
+【要求】
+1. 标题包含区域名称，吸引目标读者
+2. 正文结构：引言 + 区域优势 + 项目推荐 + 购房建议 + 结语
+3. 重点介绍【重点区域】的度假别墅/养老地产价值
+4. 段落简短，适合手机阅读
+5. 字数800-1200字
+6. 使用 Markdown 格式"""
+}
+
+# 多篇文章合并为一次请求时的输出格式
+BATCH_OUTPUT_PATTERN = re.compile(r'<<<OUT_(\d+)>>>(.*?)<<<END_\1>>>', re.DOTALL)
+
+# 各类文章的标题模板（format 字符串，{t} 为原始标题）
+_TITLE_TEMPLATES = {
+    "policy": (
+        "重磅！{t}",
+        "买房必看：{t}",
+        "政策解读：{t}",
+        "最新！{t}，宁波购房者注意"
+    ),
+    "market": (
+        "{t}，市场风向变了？",
+        "最新数据：{t}",
+        "楼市观察：{t}",
+        "买房人必看：{t}"
+    ),
+    "regional": (
+        "{t}",
+        "为什么选择这里买房？{t}",
+        "{t}，度假置业的理想选择"
+    )
+}
+
+# 各分类的固定标签
+_CATEGORY_TAGS = {
+    "policy": ("政策解读", "购房政策"),
+    "market": ("市场分析", "房价走势"),
+    "regional": ("区域推荐", "度假别墅")
+}
+
+
+def _summary(content: str, limit: int = 200) -> str:
+    """截取正文开头作为摘要"""
+    return content if len(content) <= limit else content[:limit] + "..."
+
 
 class ArticleGenerator:
     """文章生成器"""
@@ -26,13 +101,53 @@ class ArticleGenerator:
         self.keywords_config = keywords_config
         self.projects_config = projects_config
 
+        # 关键词 -> 最先包含它的项目序号，匹配时取序号最小者以保持配置优先级
+        self._keyword_project_index: Dict[str, int] = {}
+        for index, project in enumerate(projects_config):
+            for keyword in project.get("keywords", []):
+                self._keyword_project_index.setdefault(keyword, index)
+
+        # 批量生成时的最大并发请求数
+        self.max_concurrency = ai_config.get("max_concurrency", 3)
+        # 每次请求合并生成的文章数（1 表示逐篇请求）
+        self.row_marshal_batch_size = max(1, ai_config.get("row_marshal_batch_size", 1))
+
+        # 失败重试（指数退避）、按服务商配额限流、连续失败熔断
+        self.max_retries = ai_config.get("max_retries", 4)
+        self.retry_base_delay = ai_config.get("retry_base_delay", 0.5)
+        self.retry_max_delay = ai_config.get("retry_max_delay", 8)
+        self._rate_limiter = RateLimiter(ai_config.get("requests_per_minute", 0))
+        self._breaker = CircuitBreaker(
+            ai_config.get("circuit_breaker_threshold", 5),
+            ai_config.get("circuit_breaker_cooldown", 60)
+        )
+
         # 初始化 AI 客户端
         self._init_ai_client()
 
+        # 响应缓存：只有 temperature 为 0 时输出可复现，才启用
+        self.cache = None
+        if self.client and self._temperature == 0:
+            cache_path = self.ai_config.get("cache_path", "./data/llm_cache.db")
+            try:
+                self.cache = LLMCache(cache_path, self.ai_config.get("cache_ttl", 7 * 24 * 3600))
+            except Exception as e:
+                logger.warning(f"AI 响应缓存初始化失败，将不使用缓存: {e}")
+
     def _init_ai_client(self):
         """初始化 AI 客户端"""
         provider = self.ai_config.get("provider", "zhipuai")
 
+        # 调用参数在初始化时解析一次，避免每次请求重复查配置
+        self._provider = provider
+        self._model = self.ai_config.get("model", "glm-4" if provider == "zhipuai" else None)
+        self._temperature = self.ai_config.get("temperature", 0.7)
+        self._max_tokens = self.ai_config.get("max_tokens", 2000)
+        # 流式接收输出，逐行交给下游处理
+        self._stream = self.ai_config.get("stream", False)
+        # 只有 OpenAI 支持 prompt_cache_key 路由
+        self._use_prompt_cache_key = provider == "openai"
+
         if provider == "zhipuai":
             try:
                 from zhipuai import ZhipuAI
@@ -44,7 +159,10 @@ class ArticleGenerator:
         elif provider == "openai":
             try:
                 from openai import OpenAI
-                self.client = OpenAI(api_key=self.ai_config.get("api_key"))
+                self.client = OpenAI(
+                    api_key=self.ai_config.get("api_key"),
+                    http_client=self._build_http_client()
+                )
                 logger.info("使用 OpenAI")
             except ImportError:
                 logger.warning("openai 未安装，将使用模板生成")
@@ -55,7 +173,8 @@ class ArticleGenerator:
                 base_url = self.ai_config.get("base_url", "https://api.minimax.chat/v1")
                 self.client = OpenAI(
                     api_key=self.ai_config.get("api_key"),
-                    base_url=base_url
+                    base_url=base_url,
+                    http_client=self._build_http_client()
                 )
                 logger.info(f"使用 MiniMax (模型: {self.ai_config.get('model', 'abab6.5s-chat')})")
             except ImportError:
@@ -64,97 +183,276 @@ class ArticleGenerator:
         else:
             self.client = None
 
-    def generate(self, item: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+        # 按服务商选定调用路径（OpenAI 和 MiniMax 使用兼容的 API 格式）
+        if self.client is None:
+            self._chat_fn = None
+        elif provider == "zhipuai":
+            self._chat_fn = self._chat_zhipuai
+        else:
+            self._chat_fn = self._chat_openai
+
+    def _build_http_client(self):
+        """
+        构建共享连接池的 httpx 客户端
+
+        并发生成时复用长连接，避免每次请求重新握手。httpx 随 openai 安装，
+        不可用时返回 None，由 SDK 使用默认客户端。
+        """
+        try:
+            import httpx
+        except ImportError:
+            return None
+
+        pool_size = max(self.max_concurrency, 1) * 2
+        return httpx.Client(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    def generate(self, item: Dict[str, Any], analysis: Dict[str, Any],
+                 on_line: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """
         生成文章
 
         Args:
             item: 原始信息项
             analysis: 分析结果
+            on_line: 逐行接收正文的回调，开启 stream 时在生成过程中即被调用，
+                     可用于提前做 Markdown 转换等下游处理；AI 流式输出中途失败改用
+                     模板时，已收到的行不完整且不会再收到模板正文，应以返回的 content 为准
 
         Returns:
             生成的文章字典
         """
+        return self._generate_article(self._article_type(item), item, analysis, on_line)
+
+    @staticmethod
+    def _article_type(item: Dict[str, Any]) -> str:
+        """根据信息分类确定文章类型"""
         category = item.get("category", "market")
+        if category in ("policy", "market"):
+            return category
+        return "regional"
 
-        if category == "policy":
-            return self.generate_policy_article(item, analysis)
-        elif category == "market":
-            return self.generate_market_article(item, analysis)
-        else:
-            return self.generate_regional_article(item, analysis)
+    async def generate_async(self, item: Dict[str, Any],
+                             analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        异步生成文章
 
-    def generate_policy_article(self, item: Dict[str, Any],
-                                 analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """生成政策解读类文章"""
-        prompt = self._build_policy_prompt(item, analysis)
+        AI 客户端为同步接口，在线程池中执行以免阻塞事件循环。
+        """
+        return await asyncio.to_thread(self.generate, item, analysis)
 
-        if self.client:
-            content = self._call_ai(prompt)
-        else:
-            content = self._generate_from_template("policy", item, analysis)
+    async def generate_many(self, pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                            renderer_factory: Optional[Callable[[], Any]] = None
+                            ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        并发生成多篇文章
 
-        title = self._generate_title(item, analysis, "policy")
+        Args:
+            pairs: (信息项, 分析结果) 列表
+            renderer_factory: 创建正文渲染器（提供 feed/close）的工厂，
+                              渲染结果写入文章的 content_html
 
-        return {
-            "title": title,
-            "content": content,
-            "category": "policy",
-            "source_item_id": item.get("url", ""),
-            "keywords": self._generate_tags(item, analysis),
-            "summary": content[:200] + "..." if len(content) > 200 else content
-        }
+        Returns:
+            与输入顺序一致的文章列表，失败的位置为对应异常
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # 启用合并请求时，每组文章共用一次 AI 调用
+        batch_size = self.row_marshal_batch_size if self.client else 1
+        groups = [pairs[i:i + batch_size] for i in range(0, len(pairs), batch_size)]
+
+        async def _generate(group: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(self._generate_group, group, renderer_factory)
+
+        results = await asyncio.gather(*(_generate(group) for group in groups),
+                                       return_exceptions=True)
+
+        articles = []
+        for group, result in zip(groups, results):
+            if isinstance(result, Exception):
+                articles.extend([result] * len(group))
+            else:
+                articles.extend(result)
+        return articles
+
+    def _generate_group(self, group: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+                        renderer_factory: Optional[Callable[[], Any]] = None
+                        ) -> List[Dict[str, Any]]:
+        """生成一组文章，多篇时合并为一次 AI 请求，解析失败则逐篇生成"""
+        if len(group) == 1:
+            item, analysis = group[0]
+            return [self._generate_rendered(item, analysis, renderer_factory)]
+
+        # 合并请求中各篇类型可能不同，系统提示词内联到各自的任务里
+        prompts = []
+        for item, analysis in group:
+            article_type = self._article_type(item)
+            prompts.append(f"{SYSTEM_PROMPTS[article_type]}\n\n"
+                           f"{self._build_prompt(article_type, item, analysis)}")
+        contents = self._call_ai_batched(prompts)
+
+        if contents is None:
+            logger.warning(f"合并请求结果解析失败，改为逐篇生成 {len(group)} 篇文章")
+            return [self._generate_rendered(item, analysis, renderer_factory)
+                    for item, analysis in group]
+
+        articles = [
+            self._assemble_article(self._article_type(item), item, analysis, content)
+            for (item, analysis), content in zip(group, contents)
+        ]
+        if renderer_factory is not None:
+            for article in articles:
+                renderer = renderer_factory()
+                self._emit_lines(article["content"], renderer.feed)
+                article["content_html"] = renderer.close()
+        return articles
+
+    def _generate_rendered(self, item: Dict[str, Any], analysis: Dict[str, Any],
+                           renderer_factory: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+        """生成文章，提供渲染器时边接收正文边转换"""
+        if renderer_factory is None:
+            return self.generate(item, analysis)
+
+        article_type = self._article_type(item)
+        renderer = renderer_factory()
+        content, from_ai, emitted = self._generate_content(article_type, item, analysis, renderer.feed)
+        if not from_ai:
+            if emitted:
+                # AI 流式输出中途失败时渲染器里残留着半篇内容，改用新的渲染器渲染模板正文
+                renderer = renderer_factory()
+            self._emit_lines(content, renderer.feed)
+
+        article = self._assemble_article(article_type, item, analysis, content)
+        article["content_html"] = renderer.close()
+        return article
+
+    def run_batch(self, items: List[Dict[str, Any]], analyses: List[Dict[str, Any]],
+                  renderer_factory: Optional[Callable[[], Any]] = None
+                  ) -> List[Union[Dict[str, Any], Exception]]:
+        """批量生成文章的同步入口"""
+        return asyncio.run(self.generate_many(list(zip(items, analyses)), renderer_factory))
+
+    def generate_policy_article(self, item: Dict[str, Any],
+                                 analysis: Dict[str, Any],
+                                 on_line: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """生成政策解读类文章"""
+        return self._generate_article("policy", item, analysis, on_line)
 
     def generate_market_article(self, item: Dict[str, Any],
-                                analysis: Dict[str, Any]) -> Dict[str, Any]:
+                                analysis: Dict[str, Any],
+                                on_line: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """生成市场分析类文章"""
-        prompt = self._build_market_prompt(item, analysis)
+        return self._generate_article("market", item, analysis, on_line)
 
-        if self.client:
-            content = self._call_ai(prompt)
-        else:
-            content = self._generate_from_template("market", item, analysis)
+    def generate_regional_article(self, item: Dict[str, Any],
+                                  analysis: Dict[str, Any],
+                                  on_line: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """生成区域聚焦类文章"""
+        return self._generate_article("regional", item, analysis, on_line)
+
+    def _generate_article(self, article_type: str, item: Dict[str, Any],
+                          analysis: Dict[str, Any],
+                          on_line: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """生成指定类型的文章，无 AI 客户端时使用模板"""
+        content, from_ai, emitted = self._generate_content(article_type, item, analysis, on_line)
+        if not from_ai:
+            if emitted:
+                # 已交给 on_line 的部分 AI 输出无法撤回，不再追加模板正文，以返回的 content 为准
+                logger.warning(f"AI 流式输出中途失败，on_line 收到的正文不完整: {item.get('title', '')}")
+            else:
+                self._emit_lines(content, on_line)
+
+        return self._assemble_article(article_type, item, analysis, content)
+
+    def _generate_content(self, article_type: str, item: Dict[str, Any],
+                          analysis: Dict[str, Any],
+                          on_line: Optional[Callable[[str], None]] = None) -> Tuple[str, bool, bool]:
+        """
+        生成正文，on_line 只接收 AI 输出的行，模板正文由调用方决定如何输出
+
+        Returns:
+            (正文, 是否由 AI 生成, on_line 是否已收到 AI 输出的行)；
+            AI 流式输出中途失败改用模板时，第三项为 True
+        """
+        emitted = False
 
-        title = self._generate_title(item, analysis, "market")
+        def _on_line(line: str):
+            nonlocal emitted
+            emitted = True
+            on_line(line)
 
+        if self.client:
+            prompt = self._build_prompt(article_type, item, analysis)
+            content = self._call_ai(prompt, article_type=article_type,
+                                    on_line=_on_line if on_line is not None else None)
+            if content:
+                return content, True, emitted
+            logger.warning(f"AI 未生成内容，改用模板: {item.get('title', '')}")
+
+        return self._generate_from_template(article_type, item, analysis), False, emitted
+
+    def _assemble_article(self, article_type: str, item: Dict[str, Any],
+                          analysis: Dict[str, Any], content: str) -> Dict[str, Any]:
+        """由已生成的正文组装文章字典"""
         return {
-            "title": title,
+            "title": self._generate_title(item, analysis, article_type),
             "content": content,
-            "category": "market",
+            "category": article_type,
             "source_item_id": item.get("url", ""),
             "keywords": self._generate_tags(item, analysis),
-            "summary": content[:200] + "..." if len(content) > 200 else content
+            "summary": _summary(content)
         }
 
-    def generate_regional_article(self, item: Dict[str, Any],
-                                  analysis: Dict[str, Any]) -> Dict[str, Any]:
-        """生成区域聚焦类文章"""
-        prompt = self._build_regional_prompt(item, analysis)
+    def _build_prompt(self, article_type: str, item: Dict[str, Any],
+                      analysis: Dict[str, Any]) -> str:
+        """按文章类型构建 AI 提示词"""
+        if article_type == "policy":
+            return self._build_policy_prompt(item, analysis)
+        elif article_type == "market":
+            return self._build_market_prompt(item, analysis)
+        return self._build_regional_prompt(item, analysis)
+
+    def _build_batched_prompt(self, prompts: List[str]) -> str:
+        """把多篇文章的提示词合并为一个请求"""
+        sections = "\n\n".join(
+            f"===ARTICLE_{i}===\n{prompt}" for i, prompt in enumerate(prompts, 1)
+        )
+        return f"""下面有 {len(prompts)} 个独立的写作任务，请分别完成。
+
+{sections}
+
+【输出格式】
+每篇文章依次用 <<<OUT_编号>>> 开头、<<<END_编号>>> 结尾，编号与 ===ARTICLE_编号=== 对应，例如：
+<<<OUT_1>>>
+（第 1 篇文章内容）
+<<<END_1>>>
+不要输出任何其他内容。"""
+
+    def _call_ai_batched(self, prompts: List[str]) -> Optional[List[str]]:
+        """
+        一次请求生成多篇文章
 
-        if self.client:
-            content = self._call_ai(prompt)
-        else:
-            content = self._generate_from_template("regional", item, analysis)
+        Returns:
+            与提示词顺序一致的文章内容，输出不完整时返回 None
+        """
+        max_tokens = self._max_tokens * len(prompts)
+        response = self._call_ai(self._build_batched_prompt(prompts), max_tokens=max_tokens)
 
-        title = self._generate_title(item, analysis, "regional")
+        outputs = {int(index): text.strip() for index, text in BATCH_OUTPUT_PATTERN.findall(response or "")}
+        contents = [outputs.get(i, "") for i in range(1, len(prompts) + 1)]
 
-        return {
-            "title": title,
-            "content": content,
-            "category": "regional",
-            "source_item_id": item.get("url", ""),
-            "keywords": self._generate_tags(item, analysis),
-            "summary": content[:200] + "..." if len(content) > 200 else content
-        }
+        if not all(contents):
+            return None
+        return contents
 
     def _build_policy_prompt(self, item: Dict[str, Any],
                              analysis: Dict[str, Any]) -> str:
-        """构建政策文章的 AI 提示词"""
+        """构建政策文章的 AI 提示词（用户消息部分）"""
         project_info = self._get_relevant_project(analysis)
 
-        prompt = f"""你是一位专业的房地产内容创作者。请基于以下信息撰写一篇微信公众号文章。
-
-【原始信息】
+        prompt = f"""【原始信息】
 标题：{item.get('title', '')}
 内容：{item.get('content', '')[:1000]}
 
@@ -163,14 +461,8 @@ class ArticleGenerator:
 市场影响：{analysis.get('market_impact', '')}
 涉及区域：{', '.join(analysis.get('regions', []))}
 
-【要求】
-1. 标题要吸引人，包含政策关键词
-2. 正文结构：引言 + 政策解读 + 市场影响 + 购房建议 + 结语
-3. 自然融入项目信息（{project_info}）
-4. 段落简短，适合手机阅读
-5. 专业但不晦涩，贴近购房者
-6. 字数800-1200字
-7. 使用 Markdown 格式
+【推荐项目】
+{project_info}
 
 请生成文章内容。"""
 
@@ -178,12 +470,10 @@ class ArticleGenerator:
 
     def _build_market_prompt(self, item: Dict[str, Any],
                              analysis: Dict[str, Any]) -> str:
-        """构建市场文章的 AI 提示词"""
+        """构建市场文章的 AI 提示词（用户消息部分）"""
         project_info = self._get_relevant_project(analysis)
 
-        prompt = f"""你是一位专业的房地产内容创作者。请基于以下信息撰写一篇微信公众号文章。
-
-【原始信息】
+        prompt = f"""【原始信息】
 标题：{item.get('title', '')}
 内容：{item.get('content', '')[:1000]}
 
@@ -192,14 +482,8 @@ class ArticleGenerator:
 情感倾向：{analysis.get('sentiment', '')}
 涉及区域：{', '.join(analysis.get('regions', []))}
 
-【要求】
-1. 标题要吸引人，包含市场关键词
-2. 正文结构：引言 + 市场现状 + 数据分析 + 购房建议 + 结语
-3. 自然融入项目信息（{project_info}）
-4. 段落简短，适合手机阅读
-5. 数据支撑，观点明确
-6. 字数800-1200字
-7. 使用 Markdown 格式
+【推荐项目】
+{project_info}
 
 请生成文章内容。"""
 
@@ -207,13 +491,11 @@ class ArticleGenerator:
 
     def _build_regional_prompt(self, item: Dict[str, Any],
                                analysis: Dict[str, Any]) -> str:
-        """构建区域文章的 AI 提示词"""
+        """构建区域文章的 AI 提示词（用户消息部分）"""
         regions = analysis.get("regions", [])
         region = regions[0] if regions else "宁波"
 
-        prompt = f"""你是一位专业的房地产内容创作者。请基于以下信息撰写一篇微信公众号文章。
-
-【原始信息】
+        prompt = f"""【原始信息】
 标题：{item.get('title', '')}
 内容：{item.get('content', '')[:1000]}
 
@@ -221,61 +503,182 @@ class ArticleGenerator:
 涉及区域：{', '.join(regions)}
 产品类型：{', '.join(analysis.get('products', []))}
 
-【要求】
-1. 标题包含区域名称，吸引目标读者
-2. 正文结构：引言 + 区域优势 + 项目推荐 + 购房建议 + 结语
-3. 重点介绍{region}的度假别墅/养老地产价值
-4. 段落简短，适合手机阅读
-5. 字数800-1200字
-6. 使用 Markdown 格式
+【重点区域】
+{region}
 
 请生成文章内容。"""
 
         return prompt
 
-    def _call_ai(self, prompt: str) -> str:
-        """调用 AI 生成内容"""
-        try:
-            provider = self.ai_config.get("provider", "zhipuai")
-
-            if provider == "zhipuai":
-                response = self.client.chat.completions.create(
-                    model=self.ai_config.get("model", "glm-4"),
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=self.ai_config.get("temperature", 0.7),
-                    max_tokens=self.ai_config.get("max_tokens", 2000)
-                )
-                return response.choices[0].message.content
-
-            elif provider == "openai" or provider == "minimax":
-                # OpenAI 和 MiniMax 使用兼容的 API 格式
-                response = self.client.chat.completions.create(
-                    model=self.ai_config.get("model"),
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=self.ai_config.get("temperature", 0.7),
-                    max_tokens=self.ai_config.get("max_tokens", 2000)
-                )
-                return response.choices[0].message.content
+    def _call_ai(self, prompt: str, max_tokens: Optional[int] = None,
+                 article_type: Optional[str] = None,
+                 on_line: Optional[Callable[[str], None]] = None) -> str:
+        """
+        调用 AI 生成内容
+
+        Args:
+            prompt: 用户消息
+            max_tokens: 最大输出 token 数，默认取配置
+            article_type: 文章类型，用于选择系统提示词
+            on_line: 逐行接收正文的回调；非流式或命中缓存时在返回前一次性回放
+        """
+        max_tokens = max_tokens or self._max_tokens
+
+        # 固定的系统提示词在前，可变的信息放在用户消息中
+        system_prompt = SYSTEM_PROMPTS.get(article_type)
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = LLMCache.make_key(
+                provider=self._provider,
+                model=self._model,
+                temperature=self._temperature,
+                max_tokens=max_tokens,
+                messages=messages
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"AI 响应缓存命中 (命中 {self.cache.hits} / 未命中 {self.cache.misses})")
+                self._emit_lines(cached, on_line)
+                return cached
+
+        if not self._breaker.allow():
+            logger.debug("AI 调用处于熔断期，跳过")
+            return ""
 
+        try:
+            content = self._chat_with_retry(messages, max_tokens,
+                                            article_type if system_prompt else None, on_line)
         except Exception as e:
             logger.error(f"AI 生成失败: {e}")
             return ""
 
+        if cache_key is not None and content:
+            self.cache.set(cache_key, content)
+
+        return content
+
+    def _chat_with_retry(self, messages: List[Dict[str, str]], max_tokens: int,
+                         article_type: Optional[str] = None,
+                         on_line: Optional[Callable[[str], None]] = None) -> str:
+        """
+        限流后调用 AI，限流、超时等临时错误按指数退避重试
+
+        流式输出已交给 on_line 的内容无法撤回，此时出错不再重试。
+        重试耗尽或遇到其他错误时抛出最后一次的异常。
+        """
+        emitted = False
+
+        def _on_line(line: str):
+            nonlocal emitted
+            emitted = True
+            on_line(line)
+
+        callback = _on_line if on_line is not None else None
+
+        for attempt in range(self.max_retries + 1):
+            self._rate_limiter.acquire()
+            try:
+                content = self._chat_fn(messages, max_tokens, article_type, callback)
+            except Exception as e:
+                if emitted or attempt >= self.max_retries or not is_transient_error(e):
+                    self._breaker.record_failure()
+                    raise
+
+                delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt)
+                delay += random.uniform(0, self.retry_base_delay)
+                logger.warning(f"AI 调用失败，{delay:.1f} 秒后重试 ({attempt + 1}/{self.max_retries}): {e}")
+                time.sleep(delay)
+            else:
+                self._breaker.record_success()
+                return content
+
+    def _chat_zhipuai(self, messages: List[Dict[str, str]], max_tokens: int,
+                      article_type: Optional[str] = None,
+                      on_line: Optional[Callable[[str], None]] = None) -> str:
+        """调用智谱 AI（会自动复用相同前缀的提示词缓存）"""
+        response = self.client.chat.completions.create(
+            model=self._model,
+            messages=messages,
+            temperature=self._temperature,
+            max_tokens=max_tokens,
+            stream=self._stream
+        )
+        return self._read_response(response, on_line)
+
+    def _chat_openai(self, messages: List[Dict[str, str]], max_tokens: int,
+                     article_type: Optional[str] = None,
+                     on_line: Optional[Callable[[str], None]] = None) -> str:
+        """调用 OpenAI 兼容接口（OpenAI / MiniMax）"""
+        extra_body = None
+        if self._use_prompt_cache_key and article_type:
+            # 同类文章路由到同一缓存分区，提高前缀缓存命中率
+            extra_body = {"prompt_cache_key": f"realestate-{article_type}-v1"}
+
+        response = self.client.chat.completions.create(
+            model=self._model,
+            messages=messages,
+            temperature=self._temperature,
+            max_tokens=max_tokens,
+            stream=self._stream,
+            extra_body=extra_body
+        )
+        return self._read_response(response, on_line)
+
+    def _read_response(self, response, on_line: Optional[Callable[[str], None]] = None) -> str:
+        """读取 AI 响应；流式响应边接收边把完整的行交给 on_line"""
+        if not self._stream:
+            content = response.choices[0].message.content or ""
+            self._emit_lines(content, on_line)
+            return content
+
+        parts = []
+        pending = ""
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content or ""
+            parts.append(delta)
+
+            if on_line is not None and "\n" in delta:
+                *lines, pending = (pending + delta).split("\n")
+                for line in lines:
+                    on_line(line)
+            elif on_line is not None:
+                pending += delta
+
+        if on_line is not None and pending:
+            on_line(pending)
+
+        return "".join(parts)
+
+    @staticmethod
+    def _emit_lines(content: str, on_line: Optional[Callable[[str], None]]):
+        """把完整正文逐行交给 on_line"""
+        if on_line is None or not content:
+            return
+
+        lines = content.split("\n")
+        if not lines[-1]:
+            lines.pop()
+        for line in lines:
+            on_line(line)
+
     def _generate_from_template(self, article_type: str,
                                  item: Dict[str, Any],
                                  analysis: Dict[str, Any]) -> str:
         """从模板生成文章"""
-        # 这里提供简单的模板回退
-        templates = {
-            "policy": self._policy_template(item, analysis),
-            "market": self._market_template(item, analysis),
-            "regional": self._regional_template(item, analysis)
-        }
-        return templates.get(article_type, "")
+        # 这里提供简单的模板回退，只渲染所需的一种
+        if article_type == "policy":
+            return self._policy_template(item, analysis)
+        elif article_type == "market":
+            return self._market_template(item, analysis)
+        elif article_type == "regional":
+            return self._regional_template(item, analysis)
+        return ""
 
     def _policy_template(self, item: Dict[str, Any], analysis: Dict[str, Any]) -> str:
         """政策文章模板"""
@@ -373,42 +776,14 @@ class ArticleGenerator:
         """生成标题"""
         base_title = item.get("title", "")
 
-        title_templates = {
-            "policy": [
-                f"重磅！{base_title}",
-                f"买房必看：{base_title}",
-                f"政策解读：{base_title}",
-                f"最新！{base_title}，宁波购房者注意"
-            ],
-            "market": [
-                f"{base_title}，市场风向变了？",
-                f"最新数据：{base_title}",
-                f"楼市观察：{base_title}",
-                f"买房人必看：{base_title}"
-            ],
-            "regional": [
-                f"{base_title}",
-                f"为什么选择这里买房？{base_title}",
-                f"{base_title}，度假置业的理想选择"
-            ]
-        }
-
-        templates = title_templates.get(article_type, [base_title])
-        return templates[0]  # 返回第一个模板，实际可以智能选择
+        templates = _TITLE_TEMPLATES.get(article_type, ("{t}",))
+        return templates[0].format(t=base_title)  # 返回第一个模板，实际可以智能选择
 
     def _generate_tags(self, item: Dict[str, Any],
                        analysis: Dict[str, Any]) -> List[str]:
         """生成文章标签"""
-        tags = []
-
         # 添加分类标签
-        category = item.get("category", "")
-        category_tags = {
-            "policy": ["政策解读", "购房政策"],
-            "market": ["市场分析", "房价走势"],
-            "regional": ["区域推荐", "度假别墅"]
-        }
-        tags.extend(category_tags.get(category, []))
+        tags = list(_CATEGORY_TAGS.get(item.get("category", ""), ()))
 
         # 添加区域标签
         regions = analysis.get("regions", [])
@@ -420,26 +795,21 @@ class ArticleGenerator:
         for product in products[:2]:
             tags.append(product)
 
-        # 确保标签唯一
-        return list(set(tags))
+        # 确保标签唯一，保留原有顺序
+        return list(dict.fromkeys(tags))
 
     def _get_relevant_project(self, analysis: Dict[str, Any]) -> str:
         """根据分析结果获取相关项目"""
-        regions = analysis.get("regions", [])
-        products = analysis.get("products", [])
-
-        # 查找匹配的项目
-        for project in self.projects_config:
-            project_regions = project.get("keywords", [])
-            project_name = project.get("name", "")
-
-            # 如果区域匹配
-            if any(region in project_regions for region in regions):
-                return project_name
-
-            # 如果产品类型匹配
-            if any(product in project_regions for product in products):
-                return project_name
+        index = self._keyword_project_index
+
+        # 查找匹配的项目（区域或产品类型命中项目关键词）
+        matched = [
+            index[keyword]
+            for keyword in (*analysis.get("regions", []), *analysis.get("products", []))
+            if keyword in index
+        ]
+        if matched:
+            return self.projects_config[min(matched)].get("name", "")
 
         # 默认项目
         return "余姚牟山玫瑰园"
@@ -0,0 +1,85 @@
+# LLM Cache Module
+# AI 响应缓存模块
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LLMCache:
+    """基于 SQLite 的 AI 响应缓存，按提示词和模型参数的 SHA-256 索引"""
+
+    def __init__(self, db_path: str, ttl_seconds: int = 7 * 24 * 3600):
+        """
+        初始化响应缓存
+
+        Args:
+            db_path: SQLite 数据库文件路径
+            ttl_seconds: 缓存有效期（秒）
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 批量生成时会在多个线程中访问
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(**fields) -> str:
+        """由提示词、模型等参数生成缓存键"""
+        payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """读取未过期的缓存内容"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, int(time.time()))
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str):
+        """写入缓存"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, int(time.time()) + self.ttl_seconds)
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """删除过期缓存，返回删除条数"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE expires_at <= ?", (int(time.time()),)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,119 @@
+# LLM Guard Module
+# AI 调用限流与熔断模块
+
+import threading
+import time
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 可重试的异常类型名（openai / zhipuai SDK 的限流、超时、连接错误）
+TRANSIENT_ERROR_NAMES = frozenset({
+    "RateLimitError",
+    "APITimeoutError",
+    "APIConnectionError",
+    "APIReachLimitError",
+    "InternalServerError",
+    "APIInternalError",
+})
+
+
+def is_transient_error(error: Exception) -> bool:
+    """判断是否为限流、超时或服务端错误等可重试的异常"""
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code == 429 or status_code >= 500
+
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class RateLimiter:
+    """按每分钟请求数限流（令牌桶，线程安全）"""
+
+    def __init__(self, requests_per_minute: int):
+        """
+        初始化限流器
+
+        Args:
+            requests_per_minute: 每分钟最大请求数，0 表示不限流
+        """
+        self.requests_per_minute = requests_per_minute
+        self._capacity = max(requests_per_minute, 1)
+        self._tokens = float(self._capacity)
+        self._rate = requests_per_minute / 60.0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """获取一个令牌，令牌不足时等待"""
+        if self.requests_per_minute <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """连续失败达到阈值后熔断，冷却期内直接跳过 AI 调用；冷却结束后只放行一个试探请求"""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0):
+        """
+        初始化熔断器
+
+        Args:
+            failure_threshold: 触发熔断的连续失败次数
+            cooldown: 熔断持续时间（秒），之后放行一个请求试探恢复
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        # 半开状态下试探请求的发出时刻，试探结束前其他请求继续跳过
+        self._probe_started_at = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """是否允许发起请求"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            now = time.monotonic()
+            if now - self._opened_at < self.cooldown:
+                return False
+            # 试探请求未返回结果超过一个冷却期时视为丢失，再放行一个
+            if self._probe_started_at is not None and now - self._probe_started_at < self.cooldown:
+                return False
+
+            self._probe_started_at = now
+            return True
+
+    def record_success(self):
+        """记录成功，关闭熔断"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started_at = None
+
+    def record_failure(self):
+        """记录失败，连续失败达到阈值（或试探失败）时熔断"""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(f"AI 调用连续失败 {self._failures} 次，暂停 {self.cooldown:.0f} 秒")
+                self._opened_at = time.monotonic()
+                self._probe_started_at = None
@@ -12,7 +12,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from utils.config_loader import ConfigLoader
-from utils.logger import get_logger, Logger
+from utils.logger import setup_logger
 from utils.http_client import HTTPClient
 
 from collectors.government_collector import (
@@ -60,12 +60,11 @@ class RealEstateNewsPublisher:
 
         # 设置日志
         log_config = self.config_loader.logging_config
-        self.logger = Logger()
-        self.logger.setup(
+        self.logger = setup_logger(
+            "realestate_publisher",
             log_file=log_config.get("file"),
             level=log_config.get("level", "INFO")
         )
-        self.logger = get_logger("realestate_publisher")
 
         self.logger.info("=" * 60)
         self.logger.info("房产资讯自动化发布代理启动")
@@ -83,7 +82,10 @@ class RealEstateNewsPublisher:
             max_retries=http_config.get("max_retries", 3),
             retry_delay=http_config.get("retry_delay", 5),
             user_agent=http_config.get("user_agent"),
-            rate_limit_delay=http_config.get("rate_limit_delay", 2)
+            rate_limit_delay=http_config.get("rate_limit_delay", 2),
+            rate_limit_jitter=http_config.get("rate_limit_jitter", 0),
+            pool_connections=http_config.get("pool_connections", 100),
+            pool_maxsize=http_config.get("pool_maxsize", 100)
         )
 
         # 分析器
@@ -239,16 +241,23 @@ class RealEstateNewsPublisher:
         # 限制文章数量
         items = items[:max_articles]
 
+        # 并发生成，各篇文章互不影响
+        analyses = [item.get("analysis", {}) for item in items]
+
+        # 流式生成时，正文边生成边转换为微信 HTML
+        renderer_factory = None
+        if self.config_loader.ai_config.get("stream", False):
+            renderer_factory = self.publisher.publishers["wechat"].create_renderer
+
+        results = self.article_generator.run_batch(items, analyses, renderer_factory)
+
         articles = []
-        for item in items:
-            try:
-                analysis = item.get("analysis", {})
-                article = self.article_generator.generate(item, analysis)
-                articles.append(article)
-                self.logger.info(f"文章生成成功: {article.get('title', '')}")
-            except Exception as e:
-                self.logger.error(f"文章生成失败: {e}")
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"文章生成失败: {result}")
                 continue
+            articles.append(result)
+            self.logger.info(f"文章生成成功: {result.get('title', '')}")
 
         self.logger.info(f"文章生成完成，共生成 {len(articles)} 篇")
         return articles
@@ -353,8 +362,7 @@ class RealEstateNewsPublisher:
 
         finally:
             # 清理资源
-            if hasattr(self, 'http_client'):
-                self.http_client.close()
+            HTTPClient.close_shared()
 
 
 def main():
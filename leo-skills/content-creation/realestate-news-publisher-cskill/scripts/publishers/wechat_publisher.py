@@ -1,15 +1,63 @@
 # WeChat Publisher Module
 # 微信公众号发布模块
 
+import asyncio
+import re
 from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 微信正文各元素的内联样式
+H1_OPEN = "<h1 style='margin: 30px 0 20px; font-size: 24px;'>"
+H2_OPEN = "<h2 style='margin: 25px 0 15px; font-size: 20px;'>"
+H3_OPEN = "<h3 style='margin: 20px 0 10px; font-size: 18px;'>"
+P_OPEN = "<p style='margin: 10px 0;'>"
+UL_OPEN = "<ul style='margin: 10px 0; padding-left: 20px;'>"
+LI_OPEN = "<li style='margin: 5px 0;'>"
+
+
+class MarkdownStreamRenderer:
+    """逐行增量转换 Markdown，配合流式生成在正文生成过程中完成转换"""
+
+    def __init__(self, publisher: "WeChatPublisher"):
+        self._publisher = publisher
+        self._blocks = []
+        self._list_lines = []
+
+    def feed(self, line: str):
+        """接收一行 Markdown，列表行暂存到列表结束后整体转换"""
+        if self._publisher._li_re.match(line):
+            self._list_lines.append(line)
+            return
+
+        self._flush_list()
+        self._blocks.append(self._publisher._markdown_to_html(line))
+
+    def close(self) -> str:
+        """结束输入，返回完整的 HTML"""
+        self._flush_list()
+        return "\n".join(self._blocks)
+
+    def _flush_list(self):
+        if self._list_lines:
+            self._blocks.append(self._publisher._markdown_to_html("\n".join(self._list_lines)))
+            self._list_lines = []
+
 
 class WeChatPublisher:
     """微信公众号发布器"""
 
+    # 正文外层容器
+    _SECTION_OPEN = (
+        "<section style=\"font-family: -apple-system, BlinkMacSystemFont, 'Helvetica Neue', "
+        "'PingFang SC', 'Hiragino Sans GB', 'Microsoft YaHei', sans-serif; "
+        "font-size: 16px; line-height: 1.8; color: #333; padding: 20px;\">\n"
+    )
+    _SECTION_CLOSE = "\n</section>"
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化微信发布器
@@ -24,6 +72,14 @@ class WeChatPublisher:
         self.auto_publish = config.get("auto_publish", False)
         self.create_as_draft = config.get("create_as_draft", True)
 
+        # Markdown 转换规则（预编译）
+        self._h1_re = re.compile(r'^# (.+)$', re.M)
+        self._h2_re = re.compile(r'^## (.+)$', re.M)
+        self._h3_re = re.compile(r'^### (.+)$', re.M)
+        self._bold_re = re.compile(r'\*\*(.+?)\*\*')
+        self._li_re = re.compile(r'(?:^[ \t]*- .*(?:\n|$))+', re.M)
+        self._p_re = re.compile(r'^(?!<(?:h[1-3]|ul|li|/ul)\b)([ \t]*\S.*)$', re.M)
+
         # 初始化微信客户端
         self._init_client()
 
@@ -35,6 +91,7 @@ class WeChatPublisher:
                 appid=self.app_id,
                 appsecret=self.app_secret
             )
+            self._configure_session(self.client)
             logger.info("微信客户端初始化成功")
         except ImportError:
             logger.warning("wechatpy 未安装，微信发布功能不可用")
@@ -43,6 +100,22 @@ class WeChatPublisher:
             logger.error(f"微信客户端初始化失败: {e}")
             self.client = None
 
+    @staticmethod
+    def _configure_session(client):
+        """为 wechatpy 内部会话挂载连接池，草稿创建、发布等请求复用长连接"""
+        session = getattr(client, "_http", None)
+        if session is None:
+            return
+
+        # 只重试幂等请求，避免重复创建草稿
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
     def publish(self, article: Dict[str, Any]) -> Dict[str, Any]:
         """
         发布文章到微信公众号
@@ -60,29 +133,95 @@ class WeChatPublisher:
         try:
             # 创建文章
             result = self._create_article(article)
+            self._log_result(article, result)
+            return result
 
-            if result.get("success"):
-                logger.info(f"文章 '{article.get('title', '')}' 发布成功")
-            else:
-                logger.error(f"文章发布失败: {result.get('error', '')}")
+        except Exception as e:
+            logger.error(f"发布文章时发生错误: {e}")
+            return {"success": False, "error": str(e)}
+
+    async def publish_async(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        异步发布文章到微信公众号
+
+        需要上传封面（提供 thumb_path 而没有 thumb_media_id）时，
+        封面上传与正文排版并行进行，两者都完成后再创建草稿。
+
+        Args:
+            article: 文章数据
+
+        Returns:
+            发布结果
+        """
+        if not self.client:
+            logger.error("微信客户端未初始化")
+            return {"success": False, "error": "微信客户端未初始化"}
+
+        try:
+            thumb_media_id = article.get("thumb_media_id", "")
+            thumb_path = article.get("thumb_path")
+
+            # wechatpy 为同步接口，放到线程中执行
+            thumb_task = None
+            if not thumb_media_id and thumb_path:
+                thumb_task = asyncio.create_task(
+                    asyncio.to_thread(self.upload_media, thumb_path, "thumb")
+                )
+
+            content_html = await asyncio.to_thread(
+                self._format_content, article.get("content", ""), article.get("content_html")
+            )
+
+            if thumb_task is not None:
+                thumb_media_id = await thumb_task or ""
 
+            result = await asyncio.to_thread(
+                self._create_article, article, content_html, thumb_media_id
+            )
+            self._log_result(article, result)
             return result
 
         except Exception as e:
             logger.error(f"发布文章时发生错误: {e}")
             return {"success": False, "error": str(e)}
 
-    def _create_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
-        """创建文章"""
+    @staticmethod
+    def _log_result(article: Dict[str, Any], result: Dict[str, Any]):
+        """记录发布结果"""
+        if result.get("success"):
+            logger.info(f"文章 '{article.get('title', '')}' 发布成功")
+        else:
+            logger.error(f"文章发布失败: {result.get('error', '')}")
+
+    def _create_article(self, article: Dict[str, Any],
+                        formatted_content: Optional[str] = None,
+                        thumb_media_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        创建文章
+
+        Args:
+            article: 文章数据
+            formatted_content: 已排版的正文，None 时在此排版
+            thumb_media_id: 封面素材 ID，None 时取文章数据，必要时上传 thumb_path
+        """
         try:
+            if formatted_content is None:
+                formatted_content = self._format_content(article.get("content", ""),
+                                                         article.get("content_html"))
+
+            if thumb_media_id is None:
+                thumb_media_id = article.get("thumb_media_id", "")
+                if not thumb_media_id and article.get("thumb_path"):
+                    thumb_media_id = self.upload_media(article["thumb_path"], "thumb") or ""
+
             # 准备文章数据
             articles_data = [{
                 "title": article.get("title", ""),
                 "author": article.get("author", "房产资讯"),
                 "digest": article.get("summary", "")[:100],
-                "content": self._format_content(article.get("content", "")),
+                "content": formatted_content,
                 "content_source_url": article.get("source_url", ""),
-                "thumb_media_id": article.get("thumb_media_id", ""),
+                "thumb_media_id": thumb_media_id,
                 "show_cover_pic": 1,
                 "need_open_comment": 1,
                 "only_fans_can_comment": 0
@@ -123,53 +262,45 @@ class WeChatPublisher:
             logger.error(f"创建文章失败: {e}")
             return {"success": False, "error": str(e)}
 
-    def _format_content(self, content: str) -> str:
+    def create_renderer(self) -> MarkdownStreamRenderer:
+        """创建增量 Markdown 渲染器，供流式生成时逐行转换正文"""
+        return MarkdownStreamRenderer(self)
+
+    def _format_content(self, content: str, html_content: Optional[str] = None) -> str:
         """格式化内容为微信富文本格式"""
-        # 将 Markdown 转换为 HTML
-        html_content = self._markdown_to_html(content)
+        # 将 Markdown 转换为 HTML（流式生成时已提前转换）
+        if html_content is None:
+            html_content = self._markdown_to_html(content)
 
         # 添加微信样式
-        styled_content = f"""
-        <section style="font-family: -apple-system, BlinkMacSystemFont, 'Helvetica Neue', 'PingFang SC', 'Hiragino Sans GB', 'Microsoft YaHei', sans-serif; font-size: 16px; line-height: 1.8; color: #333; padding: 20px;">
-            {html_content}
-        </section>
-        """
-
-        return styled_content
+        return self._SECTION_OPEN + html_content + self._SECTION_CLOSE
 
     def _markdown_to_html(self, markdown: str) -> str:
         """简单的 Markdown 转 HTML"""
-        html = markdown
+        # 列表：连续的 "- " 行合并为一个 <ul>
+        html = self._li_re.sub(self._render_list, markdown)
 
         # 标题转换
-        html = html.replace("### ", "<h3 style='margin: 20px 0 10px; font-size: 18px;'>").replace("\n", "</h3>\n", 1)
-        html = html.replace("## ", "<h2 style='margin: 25px 0 15px; font-size: 20px;'>").replace("\n", "</h2>\n", 1)
-        html = html.replace("# ", "<h1 style='margin: 30px 0 20px; font-size: 24px;'>").replace("\n", "</h1>\n", 1)
-
-        # 粗体
-        html = html.replace("**", "<strong>", 1).replace("**", "</strong>", 1)
-
-        # 列表
-        lines = html.split("\n")
-        formatted_lines = []
-        in_list = False
-
-        for line in lines:
-            if line.strip().startswith("- "):
-                if not in_list:
-                    formatted_lines.append("<ul style='margin: 10px 0; padding-left: 20px;'>")
-                    in_list = True
-                formatted_lines.append(f"<li style='margin: 5px 0;'>{line.strip()[2:]}</li>")
-            else:
-                if in_list:
-                    formatted_lines.append("</ul>")
-                    in_list = False
-                formatted_lines.append(f"<p style='margin: 10px 0;'>{line}</p>")
+        html = self._h3_re.sub(H3_OPEN + r"\1</h3>", html)
+        html = self._h2_re.sub(H2_OPEN + r"\1</h2>", html)
+        html = self._h1_re.sub(H1_OPEN + r"\1</h1>", html)
 
-        if in_list:
-            formatted_lines.append("</ul>")
+        # 其余非空行作为段落
+        html = self._p_re.sub(P_OPEN + r"\1</p>", html)
 
-        return "\n".join(formatted_lines)
+        # 粗体
+        return self._bold_re.sub(r"<strong>\1</strong>", html)
+
+    @staticmethod
+    def _render_list(match: "re.Match") -> str:
+        """将一组列表行渲染为 <ul>"""
+        block = match.group(0)
+        items = "\n".join(
+            f"{LI_OPEN}{line.strip()[2:]}</li>"
+            for line in block.splitlines()
+        )
+        tail = "\n" if block.endswith("\n") else ""
+        return f"{UL_OPEN}\n{items}\n</ul>{tail}"
 
     def upload_media(self, file_path: str, media_type: str = "image") -> Optional[str]:
         """
@@ -188,7 +319,7 @@ class WeChatPublisher:
 
         try:
             with open(file_path, "rb") as f:
-                result = self.client.material.add(material_type, f)
+                result = self.client.material.add(media_type, f)
                 media_id = result.get("media_id", "")
                 logger.info(f"媒体文件上传成功: {media_id}")
                 return media_id
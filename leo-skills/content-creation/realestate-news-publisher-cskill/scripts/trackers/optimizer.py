@@ -1,12 +1,74 @@
 # Optimizer Module
 # 优化器模块
 
-from typing import Dict, Any, List
+import heapq
+import re
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+import numpy as np
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 标题特征：按分支顺序确定优先级（疑问 > 数字 > 紧迫 > 利益），
+# 命中的分组名即特征名，一次 match 完成分类
+_TITLE_PATTERN = re.compile(
+    r'(?=.*[？吗])(?P<question_format>)'
+    r'|(?=.*[0-9])(?P<number_format>)'
+    r'|(?=.*(?:紧急|必看|注意))(?P<urgent_format>)'
+    r'|(?=.*(?:利好|优惠|福利))(?P<benefit_format>)',
+    re.S
+)
+
+# 内容长度分档：< 800 字、800-1200 字、> 1200 字
+LENGTH_BINS = np.array([800, 1200])
+LENGTH_TYPES = ("short", "medium", "long")
+
+# 建议中使用的标题特征、长度分档名称
+TITLE_FORMAT_NAMES = {
+    "question_format": "疑问式",
+    "number_format": "数字式",
+    "urgent_format": "紧迫式",
+    "benefit_format": "利益式"
+}
+LENGTH_NAMES = {
+    "short": "短篇 (<800字)",
+    "medium": "中篇 (800-1200字)",
+    "long": "长篇 (>1200字)"
+}
+
+
+# ISO 时间戳中的小时：YYYY-MM-DDTHH: 或 YYYY-MM-DD HH:
+_ISO_HOUR_RE = re.compile(r'\d{4}-\d\d-\d\d[T ]([01]\d|2[0-3]):', re.A)
+
+
+@lru_cache(maxsize=4096)
+def _parse_hour(publish_time: str) -> Optional[int]:
+    """按完整 ISO 格式解析发布时间的小时（慢路径，结果缓存）"""
+    try:
+        return datetime.fromisoformat(publish_time).hour
+    except ValueError:
+        return None
+
+
+def _publish_hour(publish_time: Any) -> Optional[int]:
+    """
+    提取发布时间的小时
+
+    常见的 ISO 时间戳直接用正则取出小时，其他格式交给 fromisoformat，
+    无法解析时返回 None。
+    """
+    if not isinstance(publish_time, str):
+        return None
+
+    match = _ISO_HOUR_RE.match(publish_time)
+    if match:
+        return int(match.group(1))
+    return _parse_hour(publish_time)
+
 
 class Optimizer:
     """内容优化器"""
@@ -41,15 +103,20 @@ class Optimizer:
             logger.info(f"文章数量不足 {self.min_articles}，跳过分析")
             return {"ready": False, "reason": "文章数量不足"}
 
+        # 阅读量只提取一次，汇总和按长度分档统计都基于同一数组
+        reads = np.fromiter((a.get("read_count", 0) for a in articles),
+                            dtype=np.int64, count=len(articles))
+        total_reads = int(reads.sum())
+
         analysis = {
             "ready": True,
             "total_articles": len(articles),
-            "total_reads": sum(a.get("read_count", 0) for a in articles),
-            "avg_reads": sum(a.get("read_count", 0) for a in articles) / len(articles),
+            "total_reads": total_reads,
+            "avg_reads": total_reads / len(articles),
             "top_topics": self._analyze_top_topics(articles),
             "best_publishing_times": self._analyze_best_times(articles),
             "title_analysis": self._analyze_titles(articles),
-            "content_length_analysis": self._analyze_content_length(articles),
+            "content_length_analysis": self._analyze_content_length(articles, reads),
             "suggestions": []
         }
 
@@ -62,62 +129,52 @@ class Optimizer:
 
     def _analyze_top_topics(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """分析最受欢迎的主题"""
-        topic_stats = {}
+        # 主题 -> [篇数, 总阅读量]
+        topic_stats = defaultdict(lambda: [0, 0])
 
         for article in articles:
             keywords = article.get("keywords", [])
             reads = article.get("read_count", 0)
 
             for keyword in keywords:
-                if keyword not in topic_stats:
-                    topic_stats[keyword] = {"count": 0, "total_reads": 0}
-                topic_stats[keyword]["count"] += 1
-                topic_stats[keyword]["total_reads"] += reads
-
-        # 计算平均阅读量并排序
-        top_topics = []
-        for topic, stats in topic_stats.items():
-            avg_reads = stats["total_reads"] / stats["count"]
-            top_topics.append({
-                "topic": topic,
-                "article_count": stats["count"],
-                "avg_reads": avg_reads
-            })
-
-        return sorted(top_topics, key=lambda x: x["avg_reads"], reverse=True)[:5]
+                stats = topic_stats[keyword]
+                stats[0] += 1
+                stats[1] += reads
+
+        # 计算平均阅读量，只取前 5 个
+        top_topics = (
+            {"topic": topic, "article_count": count, "avg_reads": total_reads / count}
+            for topic, (count, total_reads) in topic_stats.items()
+        )
+
+        return heapq.nlargest(5, top_topics, key=itemgetter("avg_reads"))
 
     def _analyze_best_times(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """分析最佳发布时间"""
-        time_stats = {}
+        # 小时 -> [篇数, 总阅读量]
+        time_stats = defaultdict(lambda: [0, 0])
 
         for article in articles:
             publish_time = article.get("publish_time", "")
             if not publish_time:
                 continue
 
-            # 提取小时（简化处理）
-            try:
-                hour = datetime.fromisoformat(publish_time).hour
-                reads = article.get("read_count", 0)
-
-                if hour not in time_stats:
-                    time_stats[hour] = {"count": 0, "total_reads": 0}
-                time_stats[hour]["count"] += 1
-                time_stats[hour]["total_reads"] += reads
-            except:
+            # 提取小时，无法解析的时间跳过
+            hour = _publish_hour(publish_time)
+            if hour is None:
                 continue
 
-        # 计算平均阅读量
-        best_times = []
-        for hour, stats in time_stats.items():
-            avg_reads = stats["total_reads"] / stats["count"]
-            best_times.append({
-                "hour": hour,
-                "avg_reads": avg_reads,
-                "count": stats["count"]
-            })
+            stats = time_stats[hour]
+            stats[0] += 1
+            stats[1] += article.get("read_count", 0)
+
+        # 计算平均阅读量，只取前 5 个
+        best_times = (
+            {"hour": hour, "avg_reads": total_reads / count, "count": count}
+            for hour, (count, total_reads) in time_stats.items()
+        )
 
-        return sorted(best_times, key=lambda x: x["avg_reads"], reverse=True)[:5]
+        return heapq.nlargest(5, best_times, key=itemgetter("avg_reads"))
 
     def _analyze_titles(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
         """分析标题特征"""
@@ -129,21 +186,13 @@ class Optimizer:
         }
 
         for article in articles:
-            title = article.get("title", "")
-            reads = article.get("read_count", 0)
+            match = _TITLE_PATTERN.match(article.get("title", ""))
+            if match is None:
+                continue
 
-            if "？" in title or "吗" in title:
-                title_patterns["question_format"]["count"] += 1
-                title_patterns["question_format"]["total_reads"] += reads
-            elif any(char in title for char in "0123456789"):
-                title_patterns["number_format"]["count"] += 1
-                title_patterns["number_format"]["total_reads"] += reads
-            elif "紧急" in title or "必看" in title or "注意" in title:
-                title_patterns["urgent_format"]["count"] += 1
-                title_patterns["urgent_format"]["total_reads"] += reads
-            elif "利好" in title or "优惠" in title or "福利" in title:
-                title_patterns["benefit_format"]["count"] += 1
-                title_patterns["benefit_format"]["total_reads"] += reads
+            stats = title_patterns[match.lastgroup]
+            stats["count"] += 1
+            stats["total_reads"] += article.get("read_count", 0)
 
         # 计算平均表现
         for pattern, stats in title_patterns.items():
@@ -154,35 +203,27 @@ class Optimizer:
 
         return title_patterns
 
-    def _analyze_content_length(self, articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_content_length(self, articles: List[Dict[str, Any]],
+                                reads: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """分析内容长度效果"""
-        length_stats = {
-            "short": {"count": 0, "total_reads": 0},  # < 800 字
-            "medium": {"count": 0, "total_reads": 0},  # 800-1200 字
-            "long": {"count": 0, "total_reads": 0}  # > 1200 字
-        }
-
-        for article in articles:
-            content = article.get("content", "")
-            reads = article.get("read_count", 0)
-            length = len(content)
-
-            if length < 800:
-                length_stats["short"]["count"] += 1
-                length_stats["short"]["total_reads"] += reads
-            elif length < 1200:
-                length_stats["medium"]["count"] += 1
-                length_stats["medium"]["total_reads"] += reads
-            else:
-                length_stats["long"]["count"] += 1
-                length_stats["long"]["total_reads"] += reads
-
-        # 计算平均值
-        for length_type, stats in length_stats.items():
-            if stats["count"] > 0:
-                stats["avg_reads"] = stats["total_reads"] / stats["count"]
-            else:
-                stats["avg_reads"] = 0
+        if reads is None:
+            reads = np.fromiter((a.get("read_count", 0) for a in articles),
+                                dtype=np.int64, count=len(articles))
+        lengths = np.fromiter((len(a.get("content", "")) for a in articles),
+                              dtype=np.int64, count=len(articles))
+
+        # 按长度分档后一次性统计各档篇数与总阅读量
+        bins = np.searchsorted(LENGTH_BINS, lengths, side="right")
+        counts = np.bincount(bins, minlength=len(LENGTH_TYPES))
+        totals = np.bincount(bins, weights=reads, minlength=len(LENGTH_TYPES)).astype(np.int64)
+
+        length_stats = {}
+        for length_type, count, total in zip(LENGTH_TYPES, counts.tolist(), totals.tolist()):
+            length_stats[length_type] = {
+                "count": count,
+                "total_reads": total,
+                "avg_reads": total / count if count > 0 else 0
+            }
 
         return length_stats
 
@@ -207,40 +248,31 @@ class Optimizer:
             )
 
         # 标题建议
-        title_analysis = analysis.get("title_analysis", {})
-        best_title_format = max(
-            title_analysis.items(),
-            key=lambda x: x[1].get("avg_reads", 0)
-        )
-        if best_title_format[1].get("avg_reads", 0) > 0:
-            format_names = {
-                "question_format": "疑问式",
-                "number_format": "数字式",
-                "urgent_format": "紧迫式",
-                "benefit_format": "利益式"
-            }
+        best_title_format = self._best_by_avg_reads(analysis.get("title_analysis", {}))
+        if best_title_format is not None:
             suggestions.append(
-                f"建议使用 {format_names.get(best_title_format[0], best_title_format[0])} 标题"
+                f"建议使用 {TITLE_FORMAT_NAMES.get(best_title_format, best_title_format)} 标题"
             )
 
         # 内容长度建议
-        length_analysis = analysis.get("content_length_analysis", {})
-        best_length = max(
-            length_analysis.items(),
-            key=lambda x: x[1].get("avg_reads", 0)
-        )
-        if best_length[1].get("avg_reads", 0) > 0:
-            length_names = {
-                "short": "短篇 (<800字)",
-                "medium": "中篇 (800-1200字)",
-                "long": "长篇 (>1200字)"
-            }
+        best_length = self._best_by_avg_reads(analysis.get("content_length_analysis", {}))
+        if best_length is not None:
             suggestions.append(
-                f"建议使用 {length_names.get(best_length[0], best_length[0])} 内容"
+                f"建议使用 {LENGTH_NAMES.get(best_length, best_length)} 内容"
             )
 
         return suggestions
 
+    @staticmethod
+    def _best_by_avg_reads(stats: Dict[str, Dict[str, Any]]) -> Optional[str]:
+        """单次遍历找出平均阅读量最高（且大于 0）的分类，并列时取靠前者"""
+        best_key, best_avg = None, 0
+        for key, values in stats.items():
+            avg_reads = values.get("avg_reads", 0)
+            if avg_reads > best_avg:
+                best_key, best_avg = key, avg_reads
+        return best_key
+
     def get_suggestions(self) -> List[str]:
         """获取优化建议"""
         return self.optimization_suggestions
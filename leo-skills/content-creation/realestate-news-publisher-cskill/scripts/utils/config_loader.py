@@ -2,11 +2,24 @@
 # 配置加载模块
 
 import os
+import re
 import yaml
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from dotenv import load_dotenv
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML 未编译 libyaml 时退化为纯 Python 解析器
+    from yaml import SafeLoader
+
+# 已解析的 YAML 文件及原文是否含环境变量占位符，按 (绝对路径, 修改时间) 缓存，文件变更后自动失效
+_YAML_CACHE: Dict[Tuple[str, int], Tuple[Dict[str, Any], bool]] = {}
+
+# 环境变量占位符 ${VAR}，可出现在字符串任意位置
+_ENV_VAR_RE = re.compile(r'\$\{([^}]+)\}')
+
 
 class ConfigLoader:
     """加载和管理配置文件"""
@@ -34,75 +47,128 @@ class ConfigLoader:
         # 加载所有配置
         self._load_all_configs()
 
-    def _load_yaml(self, file_path: Path) -> Dict[str, Any]:
-        """加载 YAML 文件"""
+    def _load_yaml_readonly(self, file_path: Path) -> Dict[str, Any]:
+        """加载 YAML 文件（返回缓存中的共享对象，调用方不得修改）"""
+        return self._load_yaml_entry(file_path)[0]
+
+    def _load_yaml_entry(self, file_path: Path) -> Tuple[Dict[str, Any], bool]:
+        """
+        加载 YAML 文件，返回 (缓存中的共享对象, 原文是否含 ${ 占位符)
+
+        同一进程内多次加载未修改的文件时直接复用解析结果。
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f) or {}
+            stat = os.stat(file_path)
         except FileNotFoundError:
             print(f"警告: 配置文件不存在: {file_path}")
-            return {}
+            return {}, False
+
+        key = (str(Path(file_path).resolve()), stat.st_mtime_ns)
+        cached = _YAML_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            data = yaml.load(raw, Loader=SafeLoader) or {}
+        except FileNotFoundError:
+            print(f"警告: 配置文件不存在: {file_path}")
+            return {}, False
         except yaml.YAMLError as e:
             print(f"错误: YAML 解析失败 {file_path}: {e}")
-            return {}
+            return {}, False
+
+        # 原文中没有 ${ 就不可能有环境变量占位符，加载时可跳过整棵配置树的遍历
+        entry = (data, b"${" in raw)
+        _YAML_CACHE[key] = entry
+        return entry
 
     def _substitute_env_vars(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """替换环境变量"""
-        if isinstance(config, dict):
-            return {k: self._substitute_env_vars(v) for k, v in config.items()}
-        elif isinstance(config, list):
-            return [self._substitute_env_vars(item) for item in config]
-        elif isinstance(config, str) and config.startswith("${") and config.endswith("}"):
-            env_var = config[2:-1]
-            return os.getenv(env_var, config)
-        return config
+        """
+        替换环境变量
+
+        支持嵌在字符串中的 ${VAR}，未设置的变量保持原样。
+        返回新的对象（逐层复制字典和列表），不修改传入的配置。
+        """
+        env = self._env
+
+        def substitute(match):
+            return env.get(match.group(1), match.group(0))
+
+        # 用显式栈代替递归：容器先浅复制入栈，出栈时再替换其中的元素
+        stack = []
+
+        def convert(value):
+            if isinstance(value, dict):
+                value = dict(value)
+                stack.append(value)
+            elif isinstance(value, list):
+                value = list(value)
+                stack.append(value)
+            elif isinstance(value, str) and "${" in value:
+                value = _ENV_VAR_RE.sub(substitute, value)
+            return value
+
+        result = convert(config)
+        while stack:
+            node = stack.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in items:
+                node[key] = convert(value)
+        return result
 
     def _load_all_configs(self):
         """加载所有配置文件"""
-        # 主配置文件
-        main_config = self._load_yaml(self.config_dir / "config.yaml")
-        self.config = self._substitute_env_vars(main_config)
+        # 环境变量快照（dotenv 加载之后），占位符替换时只做普通字典查找
+        self._env = dict(os.environ)
+
+        # 主配置文件（替换环境变量时会生成新的对象，不影响缓存；
+        # 没有占位符时只复制顶层，各分节与缓存共享，只读使用）
+        main_config, has_env = self._load_yaml_entry(self.config_dir / "config.yaml")
+        self.config = self._substitute_env_vars(main_config) if has_env else dict(main_config)
 
-        # 数据源配置
-        self.sources = self._load_yaml(self.config_dir / "sources.yaml")
+        # 数据源配置（只读）
+        self.sources = self._load_yaml_readonly(self.config_dir / "sources.yaml")
 
-        # 关键词配置
-        self.keywords = self._load_yaml(self.config_dir / "keywords.yaml")
+        # 关键词配置（只读）
+        self.keywords = self._load_yaml_readonly(self.config_dir / "keywords.yaml")
 
-    @property
+    # 各分节配置在首次访问时取出并缓存；缺省的分节以空字典写回 config，修改会同步到 config
+    @cached_property
     def ai_config(self) -> Dict[str, Any]:
         """获取 AI 配置"""
-        return self.config.get("ai", {})
+        return self.config.setdefault("ai", {})
 
-    @property
+    @cached_property
     def schedule_config(self) -> Dict[str, Any]:
         """获取调度配置"""
-        return self.config.get("schedule", {})
+        return self.config.setdefault("schedule", {})
 
-    @property
+    @cached_property
     def content_config(self) -> Dict[str, Any]:
         """获取内容配置"""
-        return self.config.get("content", {})
+        return self.config.setdefault("content", {})
 
-    @property
+    @cached_property
     def wechat_config(self) -> Dict[str, Any]:
         """获取微信配置"""
-        return self.config.get("wechat", {})
+        return self.config.setdefault("wechat", {})
 
-    @property
+    @cached_property
     def database_config(self) -> Dict[str, Any]:
         """获取数据库配置"""
-        return self.config.get("database", {})
+        return self.config.setdefault("database", {})
 
-    @property
+    @cached_property
     def logging_config(self) -> Dict[str, Any]:
         """获取日志配置"""
-        return self.config.get("logging", {})
+        return self.config.setdefault("logging", {})
 
-    @property
+    @cached_property
     def http_config(self) -> Dict[str, Any]:
         """获取 HTTP 配置"""
-        return self.config.get("http", {})
+        return self.config.setdefault("http", {})
 
     def get(self, key: str, default: Any = None) -> Any:
         """获取配置值"""
@@ -1,16 +1,95 @@
 # HTTP Client Module
 # HTTP 客户端模块
 
+import asyncio
 import time
 import random
-from typing import Optional, Dict, Any
+import threading
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 from .logger import get_logger
 
+try:
+    import httpx
+except ImportError:  # 未安装 httpx 时仅提供同步接口
+    httpx = None
+
+try:
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+# 允许重试的幂等请求方法、需要重试的响应状态码及退避系数（第 n 次重试前等待 系数 × 2^(n-1) 秒）
+RETRY_METHODS = frozenset({"HEAD", "GET", "OPTIONS"})
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRY_BACKOFF_FACTOR = 1
+
+# 进程内共享的会话，按 (重试次数, 主机连接池数, 单主机连接数, 默认请求头) 复用，
+# 多个客户端访问同一主机时共用已建立的连接，免去重复的 TCP/TLS 握手
+_SHARED_SESSIONS: Dict[Tuple, requests.Session] = {}
+_SHARED_SESSIONS_LOCK = threading.Lock()
+
+
+def _get_shared_session(max_retries: int, pool_connections: int,
+                        pool_maxsize: int, headers: Dict[str, str]) -> requests.Session:
+    """获取（必要时创建）共享会话，默认请求头设置在会话上"""
+    key = (max_retries, pool_connections, pool_maxsize, tuple(sorted(headers.items())))
+    with _SHARED_SESSIONS_LOCK:
+        session = _SHARED_SESSIONS.get(key)
+        if session is None:
+            # 配置重试策略
+            retry_strategy = Retry(
+                total=max_retries,
+                backoff_factor=RETRY_BACKOFF_FACTOR,
+                status_forcelist=sorted(RETRY_STATUS_CODES),
+                allowed_methods=sorted(RETRY_METHODS)
+            )
+
+            session = requests.Session()
+            session.headers.update(headers)
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=retry_strategy,
+                pool_block=False
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SHARED_SESSIONS[key] = session
+        return session
+
+
+# 进程内共享的异步客户端及其所属事件循环（httpx 的连接绑定在创建它的事件循环上）
+_async_client = None
+_async_client_loop = None
+# 尚未退出的 HTTPClient.async_scope 层数，最外层退出时关闭共享的异步客户端
+_async_scope_depth = 0
+
+
+def _get_async_client():
+    """获取当前事件循环的共享 httpx.AsyncClient，事件循环变化时重新创建"""
+    global _async_client, _async_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        if _async_client is not None and not _async_client.is_closed:
+            logger.warning("上一个事件循环的异步客户端未关闭，请在 HTTPClient.async_scope() 内发送异步请求")
+        _async_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            follow_redirects=True
+        )
+        _async_client_loop = loop
+    return _async_client
+
 
 class HTTPClient:
     """HTTP 客户端，支持重试和速率限制"""
@@ -20,7 +99,11 @@ class HTTPClient:
                  max_retries: int = 3,
                  retry_delay: int = 5,
                  user_agent: str = None,
-                 rate_limit_delay: float = 2.0):
+                 rate_limit_delay: float = 2.0,
+                 rate_limit_jitter: float = 0.0,
+                 pool_connections: int = 100,
+                 pool_maxsize: int = 100,
+                 max_concurrency: int = 10):
         """
         初始化 HTTP 客户端
 
@@ -30,26 +113,22 @@ class HTTPClient:
             retry_delay: 重试延迟（秒）
             user_agent: User-Agent 字符串
             rate_limit_delay: 请求间延迟（秒）
+            rate_limit_jitter: 请求间延迟额外叠加的随机时长上限（秒），0 表示不加
+            pool_connections: 连接池缓存的主机数
+            pool_maxsize: 每个主机保持的最大连接数
+            max_concurrency: 异步接口的最大并发请求数
         """
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.rate_limit_delay = rate_limit_delay
-        self.last_request_time = 0
-
-        # 配置重试策略
-        retry_strategy = Retry(
-            total=max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-
-        # 创建会话
-        self.session = requests.Session()
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        self.rate_limit_jitter = rate_limit_jitter
+        # 每个主机下一次允许发送请求的时刻（time.monotonic），不同主机互不阻塞
+        self._next_ready: Dict[str, float] = {}
+        self._rate_limit_lock = threading.Lock()
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._semaphore_loop = None
 
         # 设置默认请求头
         self.headers = {
@@ -60,22 +139,37 @@ class HTTPClient:
             ),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate',
+            # 安装了 brotli / zstandard 时 urllib3 会额外声明 br、zstd，响应体更小
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive',
         }
 
-    def _rate_limit(self):
-        """实施速率限制"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
+        # 使用进程内共享的会话（连接池），默认请求头由会话合并，单次请求只需传入额外的请求头
+        self.session = _get_shared_session(max_retries, pool_connections, pool_maxsize, self.headers)
 
-        if time_since_last_request < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_request
-            # 添加随机性以避免检测
-            sleep_time += random.uniform(0, 0.5)
-            time.sleep(sleep_time)
+    def _reserve_slot(self, url: str) -> float:
+        """按主机预约发送时刻，同一主机的请求间隔至少 rate_limit_delay，返回需等待的秒数"""
+        host = urlsplit(url).netloc
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            ready = max(now, self._next_ready.get(host, 0.0))
+            interval = self.rate_limit_delay
+            if self.rate_limit_jitter > 0:
+                interval += random.uniform(0, self.rate_limit_jitter)
+            self._next_ready[host] = ready + interval
+        return ready - now
 
-        self.last_request_time = time.time()
+    def _rate_limit(self, url: str):
+        """实施速率限制"""
+        wait = self._reserve_slot(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def _rate_limit_async(self, url: str):
+        """实施速率限制（异步等待，与同步请求共用每个主机的发送时刻）"""
+        wait = self._reserve_slot(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
 
     def get(self,
             url: str,
@@ -94,18 +188,13 @@ class HTTPClient:
         Returns:
             响应对象，失败时返回 None
         """
-        self._rate_limit()
-
-        # 合并请求头
-        request_headers = self.headers.copy()
-        if headers:
-            request_headers.update(headers)
+        self._rate_limit(url)
 
         try:
             response = self.session.get(
                 url,
                 params=params,
-                headers=request_headers,
+                headers=headers,
                 timeout=self.timeout,
                 **kwargs
             )
@@ -113,15 +202,15 @@ class HTTPClient:
             return response
 
         except requests.exceptions.Timeout:
-            logger.error(f"请求超时: {url}")
+            logger.error("请求超时: %s", url)
         except requests.exceptions.TooManyRedirects:
-            logger.error(f"重定向过多: {url}")
+            logger.error("重定向过多: %s", url)
         except requests.exceptions.SSLError:
-            logger.error(f"SSL 错误: {url}")
+            logger.error("SSL 错误: %s", url)
         except requests.exceptions.HTTPError as e:
-            logger.error(f"HTTP 错误: {url} - {e.response.status_code}")
+            logger.error("HTTP 错误: %s - %s", url, e.response.status_code)
         except requests.exceptions.RequestException as e:
-            logger.error(f"请求失败: {url} - {e}")
+            logger.error("请求失败: %s - %s", url, e)
 
         return None
 
@@ -144,19 +233,14 @@ class HTTPClient:
         Returns:
             响应对象，失败时返回 None
         """
-        self._rate_limit()
-
-        # 合并请求头
-        request_headers = self.headers.copy()
-        if headers:
-            request_headers.update(headers)
+        self._rate_limit(url)
 
         try:
             response = self.session.post(
                 url,
                 data=data,
                 json=json,
-                headers=request_headers,
+                headers=headers,
                 timeout=self.timeout,
                 **kwargs
             )
@@ -164,12 +248,157 @@ class HTTPClient:
             return response
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"POST 请求失败: {url} - {e}")
+            logger.error("POST 请求失败: %s - %s", url, e)
             return None
 
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """获取当前事件循环的并发信号量"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _request_async(self, method: str, url: str,
+                             headers: Optional[Dict[str, str]] = None, **kwargs):
+        """
+        通过共享的 httpx.AsyncClient 发送请求
+
+        并发数受信号量限制，同一主机的请求间隔与同步接口一致；与同步会话相同，
+        只有 RETRY_METHODS 中的幂等请求会在限流、服务端错误和连接错误时按指数退避重试。
+        """
+        if httpx is None:
+            raise RuntimeError("异步请求需要安装 httpx: pip install httpx")
+
+        # 合并请求头
+        request_headers = self.headers.copy()
+        if headers:
+            request_headers.update(headers)
+
+        max_retries = self.max_retries if method.upper() in RETRY_METHODS else 0
+
+        try:
+            async with self._get_semaphore():
+                for attempt in range(max_retries + 1):
+                    await self._rate_limit_async(url)
+                    try:
+                        response = await _get_async_client().request(
+                            method,
+                            url,
+                            headers=request_headers,
+                            timeout=self.timeout,
+                            **kwargs
+                        )
+                    except httpx.TransportError:
+                        if attempt >= max_retries:
+                            raise
+                    else:
+                        if (response.status_code not in RETRY_STATUS_CODES
+                                or attempt >= max_retries):
+                            break
+                    await asyncio.sleep(RETRY_BACKOFF_FACTOR * 2 ** attempt)
+
+            response.raise_for_status()
+            return response
+
+        except httpx.TimeoutException:
+            logger.error("请求超时: %s", url)
+        except httpx.TooManyRedirects:
+            logger.error("重定向过多: %s", url)
+        except httpx.HTTPStatusError as e:
+            logger.error("HTTP 错误: %s - %s", url, e.response.status_code)
+        except httpx.HTTPError as e:
+            logger.error("%s 请求失败: %s - %s", method, url, e)
+
+        return None
+
+    async def get_async(self,
+                        url: str,
+                        params: Optional[Dict[str, Any]] = None,
+                        headers: Optional[Dict[str, str]] = None,
+                        **kwargs):
+        """
+        异步发送 GET 请求
+
+        多个请求可通过 asyncio.gather 并发执行，同一主机复用连接（安装 h2 时使用 HTTP/2 多路复用）。
+
+        Args:
+            url: 请求 URL
+            params: 查询参数
+            headers: 额外的请求头
+            **kwargs: 其他请求参数
+
+        Returns:
+            httpx.Response 对象，失败时返回 None
+        """
+        return await self._request_async("GET", url, headers=headers, params=params, **kwargs)
+
+    async def post_async(self,
+                         url: str,
+                         data: Optional[Dict[str, Any]] = None,
+                         json: Optional[Dict[str, Any]] = None,
+                         headers: Optional[Dict[str, str]] = None,
+                         **kwargs):
+        """
+        异步发送 POST 请求
+
+        Args:
+            url: 请求 URL
+            data: 表单数据
+            json: JSON 数据
+            headers: 额外的请求头
+            **kwargs: 其他请求参数
+
+        Returns:
+            httpx.Response 对象，失败时返回 None
+        """
+        return await self._request_async("POST", url, headers=headers, data=data, json=json, **kwargs)
+
     def close(self):
-        """关闭会话"""
-        self.session.close()
+        """会话由所有客户端共享，这里不关闭；进程退出前调用 close_shared()"""
+
+    @classmethod
+    def close_shared(cls):
+        """关闭所有共享会话"""
+        with _SHARED_SESSIONS_LOCK:
+            sessions = list(_SHARED_SESSIONS.values())
+            _SHARED_SESSIONS.clear()
+
+        for session in sessions:
+            session.close()
+
+        # 异步客户端只能在所属事件循环内关闭（见 async_scope / aclose_shared），这里只丢弃引用
+        global _async_client, _async_client_loop
+        _async_client = None
+        _async_client_loop = None
+
+    @classmethod
+    async def aclose_shared(cls):
+        """在事件循环内关闭共享的异步客户端"""
+        global _async_client, _async_client_loop
+        client = _async_client
+        _async_client = None
+        _async_client_loop = None
+        if client is not None:
+            await client.aclose()
+
+    @classmethod
+    @asynccontextmanager
+    async def async_scope(cls):
+        """
+        限定共享异步客户端的生命周期
+
+        在 asyncio.run 创建的临时事件循环中使用异步接口时，用 async with 包住所有请求，
+        最外层退出时在同一事件循环内关闭客户端，连接不会随事件循环结束而泄漏。
+        """
+        global _async_scope_depth
+        _async_scope_depth += 1
+        try:
+            yield
+        finally:
+            _async_scope_depth -= 1
+            if _async_scope_depth == 0:
+                await cls.aclose_shared()
 
     def __enter__(self):
         return self
@@ -1,53 +1,67 @@
 # Logger Module
 # 日志模块
 
+import atexit
 import logging
+import queue
 import sys
+import threading
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
 
-class Logger:
-    """日志管理器"""
-
-    _instance = None
-    _initialized = False
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def __init__(self):
-        if self._initialized:
-            return
-        self._initialized = True
-        self.loggers = {}
-
-    def setup(self,
-              name: str = "realestate_publisher",
-              log_file: Optional[str] = None,
-              level: str = "INFO",
-              max_bytes: int = 10 * 1024 * 1024,
-              backup_count: int = 5) -> logging.Logger:
-        """
-        设置日志器
-
-        Args:
-            name: 日志器名称
-            log_file: 日志文件路径
-            level: 日志级别
-            max_bytes: 单个日志文件最大大小
-            backup_count: 保留的日志文件数量
-
-        Returns:
-            配置好的日志器
-        """
-        if name in self.loggers:
-            return self.loggers[name]
-
-        logger = logging.getLogger(name)
+# 控制台与文件日志格式，所有日志器共用
+_CONSOLE_FMT = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+_FILE_FMT = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# 已配置处理器的日志器名称；日志器本身由 logging 模块登记和复用
+_configured = set()
+_configure_lock = threading.Lock()
+
+# 后台写日志文件的监听线程，进程退出时停止并写完队列中剩余的记录
+_listeners = []
+
+
+@atexit.register
+def _stop_listeners():
+    """停止所有日志监听线程"""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def setup_logger(name: str = "realestate_publisher",
+                 log_file: Optional[str] = None,
+                 level: str = "INFO",
+                 max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 5) -> logging.Logger:
+    """
+    设置日志器（同一名称只配置一次，之后直接返回）
+
+    Args:
+        name: 日志器名称
+        log_file: 日志文件路径
+        level: 日志级别
+        max_bytes: 单个日志文件最大大小
+        backup_count: 保留的日志文件数量
+
+    Returns:
+        配置好的日志器
+    """
+    logger = logging.getLogger(name)
+    if name in _configured:
+        return logger
+
+    with _configure_lock:
+        if name in _configured:
+            return logger
+
         logger.setLevel(getattr(logging, level.upper(), logging.INFO))
 
         # 清除现有处理器
@@ -56,13 +70,7 @@ class Logger:
         # 控制台处理器
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-
-        # 控制台格式
-        console_format = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        console_handler.setFormatter(console_format)
+        console_handler.setFormatter(_CONSOLE_FMT)
         logger.addHandler(console_handler)
 
         # 文件处理器
@@ -77,29 +85,22 @@ class Logger:
                 encoding='utf-8'
             )
             file_handler.setLevel(getattr(logging, level.upper(), logging.INFO))
+            file_handler.setFormatter(_FILE_FMT)
 
-            # 文件格式
-            file_format = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            file_handler.setFormatter(file_format)
-            logger.addHandler(file_handler)
-
-        self.loggers[name] = logger
-        return logger
-
-    def get_logger(self, name: str = "realestate_publisher") -> logging.Logger:
-        """获取日志器"""
-        if name not in self.loggers:
-            return self.setup(name)
-        return self.loggers[name]
+            # 日志器只把记录放入队列，由后台线程写文件，调用方不阻塞在磁盘 I/O 和文件轮转上
+            log_queue = queue.Queue(-1)
+            listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+            listener.start()
+            _listeners.append(listener)
+            logger.addHandler(QueueHandler(log_queue))
 
+        _configured.add(name)
 
-# 全局日志器实例
-_logger_instance = Logger()
+    return logger
 
 
 def get_logger(name: str = "realestate_publisher") -> logging.Logger:
-    """获取日志器的便捷函数"""
-    return _logger_instance.get_logger(name)
+    """获取日志器的便捷函数（首次获取时配置控制台输出）"""
+    if name in _configured:
+        return logging.getLogger(name)
+    return setup_logger(name)
@@ -0,0 +1,166 @@
+"""
+去AI化处理器回归测试
+====================
+替换表一次扫描的实现需与逐项 str.replace 的结果一致；口语化元素的抽样比例保持不变
+"""
+
+import importlib.util
+import random
+import re
+import sys
+from pathlib import Path
+
+GUIDELINES_DIR = Path(__file__).parent.parent / "leo-config" / "guidelines"
+CONFIG_PATH = str(GUIDELINES_DIR / "deaiification_guide.yaml")
+
+
+def load_module_from_file(module_name: str, file_path: str):
+    """从文件直接加载模块"""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+deaiifier = load_module_from_file("deaiifier", str(GUIDELINES_DIR / "deaiifier.py"))
+
+
+def chained_replace(text: str, mapping) -> str:
+    """优化前的逐项替换"""
+    for old, new in mapping.items():
+        text = text.replace(old, new)
+    return text
+
+
+def reference_creative(processor, text: str) -> str:
+    """优化前创意模式的替换步骤（不含随机的口语化元素）"""
+    text = chained_replace(text, processor.creative_config.get('marketing_jargon_replacements', {}))
+    text = chained_replace(text, processor.creative_config.get('avoid_absolutes', {}))
+    text = re.sub(r'(\d+)%', r'\1%左右', text)
+    text = text.replace('6个月', '差不多半年')
+    text = text.replace('12个月', '差不多一年')
+    return text
+
+
+def reference_formal(processor, text: str, rng: random.Random) -> str:
+    """优化前的严谨模式"""
+    text = chained_replace(text, processor.formal_config.get('avoid_exaggeration', {}))
+    text = text.replace('高达', '约')
+    text = text.replace('轻松', '')
+    text = text.replace('！', '。')
+    text = re.sub(r'(\d+)([％%])(?![左右约约])', r'\1\2左右', text)
+    text = re.sub(r'(\d+)万(?![左右约约])', r'\1万左右', text)
+
+    disclaimers = processor.formal_config.get('risk_disclaimers', [])
+    if any(keyword in text for keyword in ['收益', '回报', '赚', '%', '％']):
+        disclaimer = rng.choice(disclaimers) if disclaimers else ""
+        if disclaimer and disclaimer not in text:
+            text = text.rstrip() + f"\n\n**风险提示**: {disclaimer}"
+    return text
+
+
+def random_texts(processor, count: int, seed: int):
+    """由替换表的键、替换结果和常见片段拼出的随机文本，覆盖相邻、重叠的命中"""
+    creative = processor.creative_config
+    formal = processor.formal_config
+    pieces = (
+        list(creative.get('marketing_jargon_replacements', {}))
+        + list(creative.get('marketing_jargon_replacements', {}).values())
+        + list(creative.get('avoid_absolutes', {}))
+        + list(formal.get('avoid_exaggeration', {}))
+        + ['高达', '轻松', '！', '6个月', '12个月', '30%', '8％', '5万', '左右', '约',
+           '收益', '回报', '，', '。\n', '房价', 'a', '的', '\n']
+    )
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 60)))
+
+
+def test_creative_replacements_match_chained_replace():
+    processor = deaiifier.DeAIifier(CONFIG_PATH)
+    processor._add_colloquial_elements = lambda text: text
+
+    for text in random_texts(processor, 2000, seed=1):
+        assert processor.process(text, mode="creative") == reference_creative(processor, text), text
+
+
+def test_formal_mode_matches_chained_replace():
+    processor = deaiifier.DeAIifier(CONFIG_PATH)
+
+    for i, text in enumerate(random_texts(processor, 2000, seed=2)):
+        processor._rng.seed(i)
+        expected = reference_formal(processor, text, random.Random(i))
+        assert processor.process(text, mode="formal") == expected, text
+
+
+def test_replacer_replaces_in_one_pass():
+    """一次扫描最左最长匹配，替换结果不会再被其他键命中（逐项替换会连锁替换）"""
+    replace = deaiifier._build_replacer({'核心卖点': '卖点优势', '卖点': '亮点', '！': '。'})
+
+    assert replace('核心卖点！卖点') == '卖点优势。亮点'
+    assert chained_replace('核心卖点！卖点', {'核心卖点': '卖点优势', '卖点': '亮点', '！': '。'}) == '亮点优势。亮点'
+
+
+def test_overlapping_tables_fall_back_to_stepwise_replacement():
+    """各步的键或替换结果相互重叠时不合并，仍按原顺序逐步替换"""
+    assert deaiifier._build_merged_replacer({'高达': '高达约'}, deaiifier.RIGOR_REPLACEMENTS) is None
+    assert deaiifier._build_creative_replacer({'爆款': '6个月'}, {}, ((), ())) is None
+    assert deaiifier._build_creative_replacer({'A': 'B'}, {}, (('我觉得',), ('差不多',))) is not None
+
+
+def test_sample_indices_distribution():
+    """抽取个数为 n·rate 的上下取整，期望与逐个按概率抽取相同，每个下标被抽中的概率均等"""
+    rng = random.Random(0)
+    indices = list(range(7))
+    rate = 0.3
+    rounds = 20000
+
+    counts = [0] * len(indices)
+    total = 0
+    for _ in range(rounds):
+        chosen = deaiifier._sample_indices(indices, rate, rng)
+        assert len(chosen) in (2, 3)
+        assert len(set(chosen)) == len(chosen)
+        total += len(chosen)
+        for i in chosen:
+            counts[i] += 1
+
+    assert abs(total / rounds - len(indices) * rate) < 0.02
+    for count in counts:
+        assert abs(count / rounds - rate) < 0.02
+
+
+def test_colloquial_elements_rates():
+    """约 15% 的候选段落加开场白，其余含逗号的段落约 10% 插入不确定性表达"""
+    processor = deaiifier.DeAIifier(CONFIG_PATH)
+    openings = processor._openings_personal
+    uncertainty = processor._uncertainty
+    lines = [f"第{i}段，内容" for i in range(200)]
+    text = '\n'.join(lines)
+
+    candidates = len(range(5, len(lines), 5))
+    opened = inserted = 0
+    rounds = 300
+    for seed in range(rounds):
+        processor._rng.seed(seed)
+        out = processor._add_colloquial_elements(text).split('\n')
+        assert len(out) == len(lines)
+        for i, line in enumerate(out):
+            if line.startswith(tuple(f"{p}，" for p in openings)):
+                assert i % 5 == 0 and i > 0
+                opened += 1
+            elif any(f"，{p}，" in line for p in uncertainty):
+                inserted += 1
+
+    assert abs(opened / (rounds * candidates) - 0.15) < 0.02
+    assert abs(inserted / (rounds * (len(lines) - opened / rounds)) - 0.1) < 0.01
+
+
+def test_colloquial_elements_skip_headings_and_tables():
+    processor = deaiifier.DeAIifier(CONFIG_PATH)
+    lines = ["# 标题，一", "| 表格，二 |"] * 50
+    text = '\n'.join(lines)
+    for seed in range(50):
+        processor._rng.seed(seed)
+        assert processor._add_colloquial_elements(text) == text
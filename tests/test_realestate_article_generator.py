@@ -0,0 +1,176 @@
+"""
+房产资讯发布技能 - 文章生成器测试
+==================================
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = (Path(__file__).parent.parent / "leo-skills" / "content-creation"
+               / "realestate-news-publisher-cskill" / "scripts")
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from generators.article_generator import ArticleGenerator  # noqa: E402
+from generators.llm_cache import LLMCache  # noqa: E402
+
+
+class ListRenderer:
+    """记录收到的行，close 时拼接返回"""
+
+    def __init__(self):
+        self.lines = []
+
+    def feed(self, line: str):
+        self.lines.append(line)
+
+    def close(self) -> str:
+        return "\n".join(self.lines)
+
+
+class FakeStreamError(Exception):
+    status_code = 503
+
+
+def make_generator(chat_fn, **ai_config) -> ArticleGenerator:
+    """构建不依赖 AI SDK 的生成器，AI 调用由 chat_fn 代替"""
+    config = {"provider": "none", "retry_base_delay": 0, "retry_max_delay": 0}
+    config.update(ai_config)
+    generator = ArticleGenerator(config, {}, {}, [])
+    generator.client = object()
+    generator._chat_fn = chat_fn
+    return generator
+
+
+ITEM = {"title": "宁波出台购房新政", "category": "policy", "url": "https://example.com/1"}
+ANALYSIS = {"policy_points": ["降低首付比例"], "regions": ["宁波"]}
+
+
+def test_stream_failure_after_emit_renders_template_only():
+    """流式输出中途失败改用模板时，content_html 只包含模板正文"""
+    calls = []
+
+    def chat_fn(messages, max_tokens, article_type=None, on_line=None):
+        calls.append(1)
+        on_line("# AI 标题")
+        on_line("半篇 AI 正文")
+        raise FakeStreamError("stream interrupted")
+
+    generator = make_generator(chat_fn)
+    article = generator._generate_rendered(ITEM, ANALYSIS, ListRenderer)
+
+    template = generator._generate_from_template("policy", ITEM, ANALYSIS)
+    assert article["content"] == template
+    assert article["content_html"] == template.rstrip("\n")
+    assert "半篇 AI 正文" not in article["content_html"]
+    # 已经输出过内容，不再重试
+    assert len(calls) == 1
+
+
+def test_stream_failure_after_emit_does_not_append_template_to_on_line():
+    """on_line 已收到部分 AI 输出时改用模板，不再把模板正文追加给 on_line"""
+    def chat_fn(messages, max_tokens, article_type=None, on_line=None):
+        on_line("# AI 标题")
+        raise FakeStreamError("stream interrupted")
+
+    generator = make_generator(chat_fn)
+    lines = []
+    article = generator.generate_policy_article(ITEM, ANALYSIS, lines.append)
+
+    assert lines == ["# AI 标题"]
+    assert article["content"] == generator._generate_from_template("policy", ITEM, ANALYSIS)
+
+
+def test_ai_failure_before_emit_sends_template_to_on_line():
+    def chat_fn(messages, max_tokens, article_type=None, on_line=None):
+        raise FakeStreamError("busy")
+
+    generator = make_generator(chat_fn, max_retries=0)
+    lines = []
+    article = generator.generate_policy_article(ITEM, ANALYSIS, lines.append)
+
+    assert "\n".join(lines) == article["content"].rstrip("\n")
+
+
+def test_stream_success_renders_ai_content():
+    def chat_fn(messages, max_tokens, article_type=None, on_line=None):
+        content = "# AI 标题\n正文"
+        generator._emit_lines(content, on_line)
+        return content
+
+    generator = make_generator(chat_fn)
+    article = generator._generate_rendered(ITEM, ANALYSIS, ListRenderer)
+
+    assert article["content"] == "# AI 标题\n正文"
+    assert article["content_html"] == "# AI 标题\n正文"
+
+
+def test_chat_with_retry_retries_transient_error_before_emit():
+    attempts = []
+
+    def chat_fn(messages, max_tokens, article_type=None, on_line=None):
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeStreamError("busy")
+        return "正文"
+
+    generator = make_generator(chat_fn, max_retries=4)
+    lines = []
+
+    assert generator._chat_with_retry([], 100, None, lines.append) == "正文"
+    assert len(attempts) == 3
+
+
+def test_chat_with_retry_does_not_retry_after_emit():
+    attempts = []
+
+    def chat_fn(messages, max_tokens, article_type=None, on_line=None):
+        attempts.append(1)
+        on_line("已输出的一行")
+        raise FakeStreamError("stream interrupted")
+
+    generator = make_generator(chat_fn, max_retries=4)
+    lines = []
+
+    with pytest.raises(FakeStreamError):
+        generator._chat_with_retry([], 100, None, lines.append)
+
+    assert len(attempts) == 1
+    assert lines == ["已输出的一行"]
+
+
+def test_open_breaker_skips_ai_call():
+    attempts = []
+
+    def chat_fn(messages, max_tokens, article_type=None, on_line=None):
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    generator = make_generator(chat_fn, circuit_breaker_threshold=2, circuit_breaker_cooldown=60)
+
+    for _ in range(4):
+        assert generator._call_ai("提示词") == ""
+
+    # 连续失败两次后熔断，后续调用直接跳过
+    assert len(attempts) == 2
+
+
+def test_cache_key_uses_requested_model(tmp_path):
+    """缓存键取实际请求的模型（zhipuai 未配置 model 时为默认的 glm-4）"""
+    models = []
+
+    def chat_fn(messages, max_tokens, article_type=None, on_line=None):
+        models.append(generator._model)
+        return f"{generator._model} 正文"
+
+    generator = make_generator(chat_fn)
+    generator.cache = LLMCache(str(tmp_path / "llm_cache.db"))
+
+    generator._model = "glm-4"
+    assert generator._call_ai("提示词") == "glm-4 正文"
+    assert generator._call_ai("提示词") == "glm-4 正文"
+
+    generator._model = "glm-4-plus"
+    assert generator._call_ai("提示词") == "glm-4-plus 正文"
+    assert models == ["glm-4", "glm-4-plus"]
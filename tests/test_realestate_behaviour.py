@@ -0,0 +1,156 @@
+"""
+房产资讯发布技能 - 行为回归测试
+================================
+固定性能优化前后有意改变或必须保持一致的输出
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+SKILL_DIR = (Path(__file__).parent.parent / "leo-skills" / "content-creation"
+             / "realestate-news-publisher-cskill")
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+from analyzers.deduplicator import Deduplicator  # noqa: E402
+from analyzers.relevance_scorer import RelevanceScorer  # noqa: E402
+from publishers.wechat_publisher import MarkdownStreamRenderer, WeChatPublisher  # noqa: E402
+
+
+def load_keywords():
+    with open(SKILL_DIR / "config" / "keywords.yaml", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+# ==================== 关键词权重 ====================
+
+def test_keyword_weights_follow_shipped_config():
+    """按 policy_primary 等分类取权重（优化前所有关键词都退回默认的 0.5）"""
+    scorer = RelevanceScorer(load_keywords())
+
+    assert scorer._find_keyword_weight("限购") == 1.0
+    assert scorer._find_keyword_weight("首付比例") == 0.8
+    assert scorer._find_keyword_weight("成交量") == 0.9
+    assert scorer._find_keyword_weight("不存在的关键词") == 0.5
+
+
+def test_keyword_weights_accept_category_keys_and_ten_point_scale():
+    config = {
+        "policy_keywords": {"primary": ["限购"], "secondary": ["新政"]},
+        "market_keywords": {"primary": ["限购", "成交量"]},
+        "keyword_weights": {"policy_keywords": 8, "market_primary": 0.3},
+    }
+    scorer = RelevanceScorer(config)
+
+    assert scorer._find_keyword_weight("新政") == 0.8
+    # 同一关键词以先出现的权重为准
+    assert scorer._find_keyword_weight("限购") == 0.8
+    assert scorer._find_keyword_weight("成交量") == 0.3
+
+
+def test_keyword_score_uses_weights():
+    scorer = RelevanceScorer(load_keywords())
+    analysis = {"detected_keywords": ["限购", "首付比例", "不存在的关键词"]}
+    assert abs(scorer._score_keywords(analysis) - (1.0 + 0.8 + 0.5) / 3) < 1e-9
+
+
+# ==================== Markdown 转换 ====================
+
+MARKDOWN = "# 标题\n\n## 二级\n正文 **粗** 和 **粗2**\n- a\n  - b\n\n### 三\n最后"
+
+EXPECTED_HTML = "\n".join([
+    "<h1 style='margin: 30px 0 20px; font-size: 24px;'>标题</h1>",
+    "",
+    "<h2 style='margin: 25px 0 15px; font-size: 20px;'>二级</h2>",
+    "<p style='margin: 10px 0;'>正文 <strong>粗</strong> 和 <strong>粗2</strong></p>",
+    "<ul style='margin: 10px 0; padding-left: 20px;'>",
+    "<li style='margin: 5px 0;'>a</li>",
+    "<li style='margin: 5px 0;'>b</li>",
+    "</ul>",
+    "",
+    "<h3 style='margin: 20px 0 10px; font-size: 18px;'>三</h3>",
+    "<p style='margin: 10px 0;'>最后</p>",
+])
+
+
+def test_markdown_to_html():
+    """
+    每个标题行各自闭合、所有粗体成对转换、空行不再包成空段落
+
+    优化前只闭合第一行的标题标签、只转换第一对 **，空行输出为 <p></p>。
+    """
+    publisher = WeChatPublisher({})
+    assert publisher._markdown_to_html(MARKDOWN) == EXPECTED_HTML
+
+
+def test_stream_renderer_matches_full_conversion():
+    publisher = WeChatPublisher({})
+    renderer = MarkdownStreamRenderer(publisher)
+    for line in MARKDOWN.split("\n"):
+        renderer.feed(line)
+    assert renderer.close() == EXPECTED_HTML
+
+
+# ==================== 相似度去重 ====================
+
+def pairwise_dedup(items, similarity, threshold):
+    """优化前的逐对比较实现，作为向量化实现的参照"""
+    to_remove = set()
+    for i in range(len(items)):
+        if i in to_remove:
+            continue
+        for j in range(i + 1, len(items)):
+            if j in to_remove:
+                continue
+            if similarity[i][j] >= threshold:
+                if items[i].get("priority", 5) >= items[j].get("priority", 5):
+                    to_remove.add(j)
+                else:
+                    to_remove.add(i)
+                    break
+    return [item for i, item in enumerate(items) if i not in to_remove]
+
+
+def test_vectorized_similarity_matches_pairwise_loop():
+    rng = random.Random(0)
+    words = ["宁波", "楼市", "成交量", "上涨", "限购", "放开", "余姚", "别墅", "首付", "降低"]
+    dedup = Deduplicator(similarity_threshold=0.6)
+
+    for _ in range(30):
+        base = [rng.choices(words, k=12) for _ in range(4)]
+        items = []
+        for _ in range(rng.randint(2, 12)):
+            tokens = list(rng.choice(base))
+            tokens[rng.randrange(len(tokens))] = rng.choice(words)
+            items.append({"title": "", "content": "".join(tokens), "priority": rng.randint(1, 10)})
+
+        texts = [dedup._tokenize(" " + item["content"]) for item in items]
+        matrix = dedup._vectorizer.transform(texts)
+        similarity = (matrix @ matrix.T).toarray()
+
+        expected = pairwise_dedup(items, similarity, dedup.similarity_threshold)
+        assert dedup._deduplicate_by_similarity(items) == expected
+
+
+def test_similarity_detects_chinese_near_duplicates():
+    """中文先经 jieba 分词，近似重复的中文资讯能被识别"""
+    dedup = Deduplicator()
+    items = [
+        {"title": "宁波出台楼市新政", "content": "宁波市住建局发布通知，首套房首付比例降至两成，公积金贷款额度提高。",
+         "priority": 5},
+        {"title": "宁波出台楼市新政", "content": "宁波市住建局发布通知，首套房首付比例降至两成，公积金贷款额度提高！",
+         "priority": 8},
+        {"title": "余姚别墅成交量上涨", "content": "四明山脚下的度假别墅本月成交量环比上涨三成。", "priority": 5},
+    ]
+
+    assert dedup._deduplicate_by_similarity(items) == [items[1], items[2]]
+
+
+def test_similarity_matrix_is_cosine():
+    dedup = Deduplicator()
+    matrix = dedup._vectorizer.transform([dedup._tokenize("宁波楼市"), dedup._tokenize("宁波楼市")])
+    similarity = (matrix @ matrix.T).toarray()
+    assert np.allclose(similarity, 1.0, atol=1e-6)
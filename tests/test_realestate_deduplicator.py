@@ -0,0 +1,65 @@
+"""
+房产资讯发布技能 - 去重器测试
+==============================
+"""
+
+import random
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = (Path(__file__).parent.parent / "leo-skills" / "content-creation"
+               / "realestate-news-publisher-cskill" / "scripts")
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from analyzers.deduplicator import Deduplicator, RecentHashSet  # noqa: E402
+
+
+def test_recent_hash_set_has_no_false_positives():
+    """大量互不相同的哈希都不应被判为已出现"""
+    rng = random.Random(0)
+    seen = RecentHashSet(capacity=50_000)
+    values = {rng.getrandbits(64) for _ in range(100_000)}
+
+    false_positives = 0
+    for value in values:
+        if value in seen:
+            false_positives += 1
+        seen.add(value)
+
+    assert false_positives == 0
+
+
+def test_recent_hash_set_is_bounded_and_evicts_oldest():
+    seen = RecentHashSet(capacity=3)
+    for value in (1, 2, 3):
+        seen.add(value)
+
+    # 1 再次出现后延后淘汰，超出容量时淘汰最久未出现的 2
+    assert 1 in seen
+    seen.add(4)
+
+    assert len(seen) == 3
+    assert 2 not in seen
+    assert all(value in seen for value in (1, 3, 4))
+
+
+def test_deduplicate_keeps_unique_items_beyond_capacity():
+    """容量不足时只会漏判很久以前的重复，不会误删新内容"""
+    dedup = Deduplicator(hash_capacity=10)
+    items = [{"title": f"标题{i}", "content": f"内容{i}", "url": f"https://example.com/{i}"}
+             for i in range(100)]
+
+    assert dedup._deduplicate_by_url_and_hash(items) == items
+    assert len(dedup.seen_hashes) == 10
+
+
+def test_deduplicate_by_url_and_hash():
+    dedup = Deduplicator()
+    items = [
+        {"title": "A", "content": "x", "url": "https://example.com/a/"},
+        {"title": "B", "content": "y", "url": "https://EXAMPLE.com/a?utm_source=feed"},
+        {"title": "A", "content": "x", "url": "https://example.com/c"},
+        {"title": "D", "content": "z", "url": "https://example.com/d"},
+    ]
+
+    assert dedup._deduplicate_by_url_and_hash(items) == [items[0], items[3]]
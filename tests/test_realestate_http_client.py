@@ -0,0 +1,137 @@
+"""
+房产资讯发布技能 - HTTP 客户端与采集器测试
+==========================================
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+SCRIPTS_DIR = (Path(__file__).parent.parent / "leo-skills" / "content-creation"
+               / "realestate-news-publisher-cskill" / "scripts")
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from utils import http_client as http_client_module  # noqa: E402
+from utils.http_client import HTTPClient  # noqa: E402
+from collectors.government_collector import GovernmentCollector  # noqa: E402
+
+
+def use_mock_transport(monkeypatch, handler):
+    """让共享的异步客户端走 httpx.MockTransport，不发出真实请求"""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_client_module, "_get_async_client", lambda: client)
+    monkeypatch.setattr(http_client_module, "RETRY_BACKOFF_FACTOR", 0)
+
+
+def test_government_collector_respects_per_host_interval(monkeypatch):
+    """并发获取详情页时，同一主机的请求仍按 rate_limit_delay 间隔发送"""
+    sent_at = []
+
+    def handler(request):
+        sent_at.append(time.monotonic())
+        return httpx.Response(200, text="<div class='content'>正文</div>")
+
+    use_mock_transport(monkeypatch, handler)
+    client = HTTPClient(rate_limit_delay=0.05)
+    collector = GovernmentCollector({"name": "测试", "url": "https://gov.example.com/"}, client)
+
+    urls = [f"https://gov.example.com/{i}" for i in range(4)]
+    contents = collector._fetch_contents(urls)
+
+    assert contents == ["正文"] * 4
+    # 事件循环可能在定时器到期前一个时钟精度内唤醒，留出少量余量
+    gaps = [b - a for a, b in zip(sent_at, sent_at[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+
+
+def test_get_async_retries_transient_status(monkeypatch):
+    statuses = iter([503, 429, 200])
+
+    def handler(request):
+        return httpx.Response(next(statuses), text="ok")
+
+    use_mock_transport(monkeypatch, handler)
+    client = HTTPClient(rate_limit_delay=0, max_retries=3)
+
+    response = asyncio.run(client.get_async("https://gov.example.com/retry"))
+
+    assert response is not None
+    assert response.status_code == 200
+
+
+def test_get_async_gives_up_after_max_retries(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        return httpx.Response(500)
+
+    use_mock_transport(monkeypatch, handler)
+    client = HTTPClient(rate_limit_delay=0, max_retries=2)
+
+    assert asyncio.run(client.get_async("https://gov.example.com/down")) is None
+    assert len(calls) == 3
+
+
+def test_post_async_is_not_retried(monkeypatch):
+    """POST 不是幂等请求，与同步会话一致不做重试"""
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(503)
+
+    use_mock_transport(monkeypatch, handler)
+    client = HTTPClient(rate_limit_delay=0, max_retries=3)
+
+    assert asyncio.run(client.post_async("https://gov.example.com/submit", json={})) is None
+    assert calls == ["POST"]
+
+
+def test_rate_limit_has_no_jitter_by_default():
+    client = HTTPClient(rate_limit_delay=2)
+    assert client._reserve_slot("https://gov.example.com/a") == 0
+    assert abs(client._reserve_slot("https://gov.example.com/b") - 2) < 0.01
+    # 不同主机互不影响
+    assert client._reserve_slot("https://news.example.com/a") == 0
+
+
+def test_rate_limit_jitter_is_opt_in():
+    client = HTTPClient(rate_limit_delay=2, rate_limit_jitter=0.5)
+    client._reserve_slot("https://gov.example.com/a")
+    wait = client._reserve_slot("https://gov.example.com/b")
+    assert 1.99 < wait <= 2.5
+
+
+def test_async_scope_closes_client_of_each_event_loop(monkeypatch):
+    """每次 asyncio.run 创建的异步客户端都在所属事件循环内关闭"""
+    created = []
+    async_client_cls = httpx.AsyncClient
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text="ok"))
+
+    def make_client(**kwargs):
+        kwargs.pop("http2", None)
+        client = async_client_cls(transport=transport, **kwargs)
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(http_client_module.httpx, "AsyncClient", make_client)
+    client = HTTPClient(rate_limit_delay=0)
+
+    async def fetch():
+        async with HTTPClient.async_scope():
+            async with HTTPClient.async_scope():
+                await client.get_async("https://gov.example.com/a")
+            # 内层退出时外层仍在使用，不关闭
+            assert not created[-1].is_closed
+            await client.get_async("https://gov.example.com/b")
+
+    asyncio.run(fetch())
+    asyncio.run(fetch())
+
+    assert len(created) == 2
+    assert all(c.is_closed for c in created)
+    assert http_client_module._async_client is None
@@ -0,0 +1,134 @@
+"""
+房产资讯发布技能 - AI 调用限流与熔断测试
+========================================
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = (Path(__file__).parent.parent / "leo-skills" / "content-creation"
+               / "realestate-news-publisher-cskill" / "scripts")
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from generators import llm_guard  # noqa: E402
+from generators.llm_guard import CircuitBreaker, RateLimiter, is_transient_error  # noqa: E402
+
+
+class FakeClock:
+    """可控的时钟，sleep 直接推进时间"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def install_clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(llm_guard.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(llm_guard.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_rate_limiter_paces_after_burst(monkeypatch):
+    clock = install_clock(monkeypatch)
+    limiter = RateLimiter(60)
+
+    # 令牌桶初始是满的，前 60 个请求不等待
+    for _ in range(60):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+    # 之后按每秒一个令牌放行
+    start = clock.now
+    for _ in range(3):
+        limiter.acquire()
+    assert abs((clock.now - start) - 3.0) < 1e-6
+
+
+def test_rate_limiter_disabled(monkeypatch):
+    clock = install_clock(monkeypatch)
+    limiter = RateLimiter(0)
+    for _ in range(1000):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+
+def test_circuit_breaker_opens_after_threshold(monkeypatch):
+    install_clock(monkeypatch)
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=10)
+
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert not breaker.allow()
+
+
+def test_circuit_breaker_half_open_allows_single_probe(monkeypatch):
+    clock = install_clock(monkeypatch)
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=10)
+    breaker.record_failure()
+
+    clock.now += 10
+    # 冷却结束后只放行一个试探请求
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.allow()
+    assert breaker.allow()
+
+
+def test_circuit_breaker_failed_probe_reopens(monkeypatch):
+    clock = install_clock(monkeypatch)
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=10)
+    breaker.record_failure()
+
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_failure()
+
+    # 试探失败后重新开始冷却
+    clock.now += 5
+    assert not breaker.allow()
+    clock.now += 5
+    assert breaker.allow()
+
+
+def test_circuit_breaker_lost_probe_is_replaced(monkeypatch):
+    clock = install_clock(monkeypatch)
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=10)
+    breaker.record_failure()
+
+    clock.now += 10
+    assert breaker.allow()
+    # 试探请求一直没有结果，一个冷却期后再放行一个
+    clock.now += 10
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_is_transient_error():
+    class RateLimitError(Exception):
+        pass
+
+    class BadRequest(Exception):
+        status_code = 400
+
+    class ServerError(Exception):
+        status_code = 502
+
+    assert is_transient_error(RateLimitError())
+    assert is_transient_error(ServerError())
+    assert is_transient_error(TimeoutError())
+    assert not is_transient_error(BadRequest())
+    assert not is_transient_error(ValueError())
@@ -0,0 +1,50 @@
+"""
+微信公众号格式化器回归测试
+==========================
+fixtures/wechat_formatter_baseline.json 由性能优化前的格式化器生成，
+当前实现对同样的样式配置和内容必须输出完全相同的 HTML
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+FORMATTER_PATH = (ROOT / "leo-skills" / "content-creation" / "content-layout-leo-cskill"
+                  / "scripts" / "formatters" / "wechat_formatter.py")
+BASELINE_PATH = Path(__file__).parent / "fixtures" / "wechat_formatter_baseline.json"
+
+
+def load_module_from_file(module_name: str, file_path: str):
+    """从文件直接加载模块"""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+wechat_formatter = load_module_from_file("wechat_formatter", str(FORMATTER_PATH))
+
+with open(BASELINE_PATH, encoding="utf-8") as f:
+    BASELINE = json.load(f)
+
+
+@pytest.mark.parametrize("case", BASELINE["cases"],
+                         ids=lambda case: f"{case['style']}-{bool(case['title'])}")
+def test_format_matches_baseline(case):
+    formatter = wechat_formatter.WeChatFormatter(BASELINE["style_config"])
+    html = formatter.format(case["content"], case["style"], case["title"], case["author"])
+    assert html == case["html"]
+
+
+def test_format_is_repeatable():
+    """样式 CSS 有缓存，重复格式化结果不变"""
+    formatter = wechat_formatter.WeChatFormatter(BASELINE["style_config"])
+    case = BASELINE["cases"][0]
+    first = formatter.format(case["content"], case["style"], case["title"], case["author"])
+    second = formatter.format(case["content"], case["style"], case["title"], case["author"])
+    assert first == second == case["html"]